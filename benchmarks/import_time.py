@@ -0,0 +1,94 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+
+Measures the cold import time of steam_interfaces.
+
+Every sample imports the package and reads one interface in a fresh interpreter, as a
+CLI tool or a serverless function does on a cold start. The run fails when the median
+exceeds the budget or when a module that should only load on the first request was imported.
+
+    python benchmarks/import_time.py --budget 50 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules only the first request may import.
+DEFERRED_MODULES = ("requests", "urllib3", "aiohttp", "asyncio", "concurrent.futures", "email.utils")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import steam_interfaces
+getattr(steam_interfaces, {name!r})
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(",".join(m for m in {deferred!r} if m in sys.modules))
+"""
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(name: str = "ISteamUser") -> tuple:
+    """
+    Import the package in a fresh interpreter.
+
+    :param name: Attribute read after the import
+    :type name: str
+    :return: Milliseconds spent and the deferred modules that were loaded
+    :rtype: tuple
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (_ROOT, os.environ.get("PYTHONPATH")))))
+    # Cold starts of deployed code read cached bytecode, so let the first run write it.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(name=name, deferred=DEFERRED_MODULES)],
+                            env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    elapsed, loaded = output.splitlines()
+    return float(elapsed), [module for module in loaded.split(",") if module]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--name", default="ISteamUser", help="attribute read after the import")
+    parser.add_argument("--runs", type=int, default=15, help="number of fresh interpreters")
+    parser.add_argument("--budget", type=float, default=50.0, help="largest accepted median, in milliseconds")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    # The first run writes the bytecode and is not counted.
+    measure(args.name)
+    samples = []
+    loaded = set()
+    for _ in range(args.runs):
+        elapsed, modules = measure(args.name)
+        samples.append(elapsed)
+        loaded.update(modules)
+
+    result = {
+        "name": args.name,
+        "runs": args.runs,
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+        "max_ms": round(max(samples), 2),
+        "budget_ms": args.budget,
+        "deferred_loaded": sorted(loaded),
+    }
+    result["ok"] = result["median_ms"] <= args.budget and not loaded
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"import steam_interfaces; steam_interfaces.{args.name}: median {result['median_ms']} ms "
+              f"(min {result['min_ms']}, max {result['max_ms']}, budget {args.budget} ms)")
+        if loaded:
+            print("loaded at import: " + ", ".join(sorted(loaded)))
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+
+Local stand-in for partner.steam-api.com and api.steampowered.com.
+
+Serves canned payloads shaped like the real responses of the methods the benchmarks
+call, generated deterministically from the request parameters, over keep-alive HTTP/1.1.
+Point an interface at it by overriding its hosts:
+
+    python benchmarks/mock_steam.py --port 8080 --latency 20
+
+    api = ISteamUser(key)
+    api._hosts = {"partner": "http://127.0.0.1:8080", "steam": "http://127.0.0.1:8080"}
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+_COUNTRIES = ("US", "DE", "RU", "BR", "CN", "SE", "UA", "PL", "FR", "GB")
+_ITEMS = (1, 29, 36, 48, 50, 63, 65, 108, 116, 135, 139, 147, 154, 160, 168, 174, 208, 214, 235, 249, 250, 263)
+
+
+def player_summary(steamid: str) -> dict:
+    rng = random.Random(int(steamid))
+    avatarhash = "%040x" % rng.getrandbits(160)
+    avatar = f"https://avatars.steamstatic.com/{avatarhash}"
+    return {
+        "steamid": steamid, "communityvisibilitystate": 3, "profilestate": 1,
+        "personaname": f"player{rng.randrange(10 ** 6)}",
+        "profileurl": f"https://steamcommunity.com/profiles/{steamid}/",
+        "avatar": f"{avatar}.jpg", "avatarmedium": f"{avatar}_medium.jpg", "avatarfull": f"{avatar}_full.jpg",
+        "avatarhash": avatarhash, "lastlogoff": 1690000000 + rng.randrange(10 ** 7),
+        "personastate": rng.randrange(7), "primaryclanid": "103582791429521408",
+        "timecreated": 1100000000 + rng.randrange(6 * 10 ** 8), "personastateflags": 0,
+        "loccountrycode": rng.choice(_COUNTRIES),
+    }
+
+
+def player_bans(steamid: str) -> dict:
+    rng = random.Random(int(steamid))
+    vac = rng.random() < 0.05
+    return {
+        "SteamId": steamid, "CommunityBanned": False, "VACBanned": vac,
+        "NumberOfVACBans": int(vac), "DaysSinceLastBan": rng.randrange(3000) if vac else 0,
+        "NumberOfGameBans": 0, "EconomyBan": "none",
+    }
+
+
+def owned_game(rng: random.Random, appid: int, include_appinfo: bool) -> dict:
+    game = {"appid": appid}
+    if include_appinfo:
+        game.update(name=f"Game {appid}", img_icon_url="%040x" % rng.getrandbits(160),
+                    has_community_visible_stats=True)
+    game.update(playtime_forever=rng.randrange(20000), playtime_windows_forever=rng.randrange(20000),
+                playtime_mac_forever=0, playtime_linux_forever=0, playtime_deck_forever=0,
+                rtime_last_played=1600000000 + rng.randrange(10 ** 8), playtime_disconnected=0)
+    return game
+
+
+def owned_games(steamid: str, include_appinfo: bool, count: int = 200) -> dict:
+    rng = random.Random(int(steamid))
+    appids = sorted(rng.sample(range(10, 2500000, 10), count))
+    return {"response": {"game_count": count,
+                         "games": [owned_game(rng, appid, include_appinfo) for appid in appids]}}
+
+
+def match_player(rng: random.Random, slot: int) -> dict:
+    player = {
+        "account_id": rng.choice((4294967295, rng.randrange(10 ** 9))),
+        "player_slot": slot, "team_number": int(slot >= 128), "team_slot": slot & 0x7f,
+        "hero_id": rng.randrange(1, 139), "hero_variant": 1,
+    }
+    for i in range(6):
+        player[f"item_{i}"] = rng.choice(_ITEMS)
+    for i in range(3):
+        player[f"backpack_{i}"] = rng.choice(_ITEMS)
+    level = rng.randrange(10, 31)
+    player.update(
+        item_neutral=rng.randrange(300, 360), item_neutral2=0,
+        kills=rng.randrange(25), deaths=rng.randrange(15), assists=rng.randrange(30), leaver_status=0,
+        last_hits=rng.randrange(600), denies=rng.randrange(40), gold_per_min=rng.randrange(200, 900),
+        xp_per_min=rng.randrange(300, 1000), level=level, net_worth=rng.randrange(5000, 40000),
+        aghanims_scepter=rng.randrange(2), aghanims_shard=rng.randrange(2), moonshard=0,
+        hero_damage=rng.randrange(60000), tower_damage=rng.randrange(15000), hero_healing=rng.randrange(5000),
+        gold=rng.randrange(3000), gold_spent=rng.randrange(10000, 40000),
+        ability_upgrades=[{"ability": rng.randrange(5000, 8000), "time": 60 * i + rng.randrange(60), "level": i + 1}
+                          for i in range(level)],
+    )
+    return player
+
+
+def match(match_id: int, match_seq_num: int = None) -> dict:
+    rng = random.Random(match_id)
+    duration = rng.randrange(1200, 4200)
+    return {
+        "players": [match_player(rng, slot) for slot in (0, 1, 2, 3, 4, 128, 129, 130, 131, 132)],
+        "radiant_win": rng.random() < 0.5, "duration": duration, "pre_game_duration": 90,
+        "start_time": 1690000000 + match_id % 10 ** 7, "match_id": match_id,
+        "match_seq_num": match_seq_num if match_seq_num is not None else match_id - 1200000000,
+        "tower_status_radiant": rng.randrange(2048), "tower_status_dire": rng.randrange(2048),
+        "barracks_status_radiant": rng.randrange(64), "barracks_status_dire": rng.randrange(64),
+        "cluster": rng.choice((122, 133, 136, 151, 181, 191)), "first_blood_time": rng.randrange(300),
+        "lobby_type": 7, "human_players": 10, "leagueid": 0, "positive_votes": 0, "negative_votes": 0,
+        "game_mode": 22, "flags": 1, "engine": 1,
+        "radiant_score": rng.randrange(60), "dire_score": rng.randrange(60),
+        "picks_bans": [{"is_pick": i >= 14, "hero_id": rng.randrange(1, 139), "team": i % 2, "order": i}
+                       for i in range(24)],
+    }
+
+
+def _ids(params: dict, name: str) -> list:
+    return [steamid for steamid in params.get(name, "").split(",") if steamid][:100]
+
+
+def _match_history_by_sequence_num(params: dict) -> dict:
+    start = int(params.get("start_at_match_seq_num", 1))
+    count = min(int(params.get("matches_requested", 100)), 100)
+    return {"result": {"status": 1, "matches": [match(seq + 1200000000, seq) for seq in range(start, start + count)]}}
+
+
+# Payload of each method, by (interface, method), built from the request parameters.
+ROUTES: Dict[Tuple[str, str], Callable[[dict], dict]] = {
+    ("ISteamUser", "GetPlayerSummaries"):
+        lambda params: {"response": {"players": [player_summary(i) for i in _ids(params, "steamids")]}},
+    ("ISteamUser", "GetPlayerBans"):
+        lambda params: {"players": [player_bans(i) for i in _ids(params, "steamids")]},
+    ("ISteamUser", "CheckAppOwnership"):
+        lambda params: {"appownership": {"ownsapp": True, "permanent": True, "timestamp": "2016-01-01T00:00:00Z",
+                                         "ownersteamid": params.get("steamid"), "result": "OK"}},
+    ("IPlayerService", "GetOwnedGames"):
+        lambda params: owned_games(params.get("steamid", "0"), params.get("include_appinfo") in ("1", "True")),
+    ("IDOTA2Match_570", "GetMatchDetails"):
+        lambda params: {"result": match(int(params.get("match_id", 0)))},
+    ("IDOTA2Match_570", "GetMatchHistoryBySequenceNum"): _match_history_by_sequence_num,
+    ("ISteamWebAPIUtil", "GetServerInfo"):
+        lambda params: {"servertime": 1700000000, "servertimestring": "Tue Nov 14 22:13:20 2023"},
+}
+
+# Methods answered without an API key.
+_PUBLIC = {("ISteamWebAPIUtil", "GetServerInfo")}
+
+
+@lru_cache(maxsize=4096)
+def _payload(interface: str, method: str, query: Tuple[Tuple[str, str], ...]) -> bytes:
+    return json.dumps(ROUTES[interface, method](dict(query)), separators=(",", ":")).encode()
+
+
+def respond(target: str, body: bytes = b"") -> Tuple[int, bytes]:
+    """
+    Answer a request.
+
+    :param target: Request path and query string
+    :type target: str
+    :param body: Form-encoded request body
+    :type body: bytes
+    :return: HTTP status and body
+    :rtype: Tuple[int, bytes]
+    """
+    url = urlsplit(target)
+    parts = url.path.strip("/").split("/")
+    if len(parts) != 3 or (parts[0], parts[1]) not in ROUTES:
+        return 404, b"<html><body><h1>Not Found</h1></body></html>"
+    interface, method = parts[0], parts[1]
+    params = dict(parse_qsl(url.query))
+    if body:
+        params.update(parse_qsl(body.decode("latin-1")))
+    if not params.pop("key", None) and (interface, method) not in _PUBLIC:
+        return 403, b"<html><body><h1>Forbidden</h1></body></html>"
+    return 200, _payload(interface, method, tuple(sorted(params.items())))
+
+
+_REASONS = {200: b"OK", 403: b"Forbidden", 404: b"Not Found", 400: b"Bad Request"}
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latency: float) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            target = request_line.split(b" ")[1].decode("latin-1")
+            length, keep_alive = 0, True
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.partition(b":")
+                name = name.strip().lower()
+                if name == b"content-length":
+                    length = int(value)
+                elif name == b"connection" and value.strip().lower() == b"close":
+                    keep_alive = False
+            body = await reader.readexactly(length) if length else b""
+            status, payload = respond(target, body)
+            if latency:
+                await asyncio.sleep(latency)
+            content_type = b"application/json; charset=UTF-8" if status == 200 else b"text/html"
+            writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\n%s\r\n"
+                         % (status, _REASONS[status], content_type, len(payload),
+                            b"" if keep_alive else b"Connection: close\r\n"))
+            writer.write(payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, IndexError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> None:
+    """
+    Serve until cancelled, printing the base URL once listening.
+
+    :param host: Address to listen on
+    :type host: str
+    :param port: Port to listen on, 0 for any free port
+    :type port: int
+    :param latency: Seconds added to every response, to simulate the network round trip
+    :type latency: float
+    """
+    server = await asyncio.start_server(lambda r, w: _handle(r, w, latency), host, port, backlog=1024)
+    print(f"http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds added to every response")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.latency / 1000))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+
+Offline throughput and latency benchmarks of steam_interfaces.
+
+Representative methods are called against the local mock server of mock_steam.py in
+three modes: one thread calling in a loop, a thread pool sharing one interface, and
+asyncio tasks sharing one aio interface. Every scenario runs in a fresh interpreter,
+so its CPU time and peak memory are its own. Results are written as JSON; comparing
+them to the results of a previous release reports regressions.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --baseline results-0.2.8.json --tolerance 0.15
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+# Benchmark the checkout the script belongs to.
+sys.path.insert(0, _ROOT)
+
+# Scenario name: interface, method, arguments of the i-th call and default number of calls.
+SCENARIOS: Dict[str, Tuple[str, str, Callable[[int], tuple], int]] = {
+    "player_summaries": ("ISteamUser", "get_player_summaries",
+                         lambda i: ([76561197960265728 + 100 * i + n for n in range(100)],), 2000),
+    "player_bans": ("ISteamUser", "get_player_bans",
+                    lambda i: ([76561197960265728 + 100 * i + n for n in range(100)],), 2000),
+    "owned_games": ("IPlayerService", "get_owned_games",
+                    lambda i: (76561197960265728 + i, 1), 1000),
+    "match_details": ("IDOTA2Match_570", "get_match_details",
+                      lambda i: (7000000000 + i,), 2000),
+    "match_sequence": ("IDOTA2Match_570", "get_match_history_by_sequence_num",
+                       lambda i: (5800000000 + 100 * i, 100), 100),
+}
+
+MODES = ("sync", "threaded", "async")
+
+# Metrics compared to the baseline, and whether higher values are better.
+_COMPARED = {"rps": True, "p50_ms": False, "p99_ms": False, "cpu_ms_per_call": False, "peak_rss_mb": False}
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    :param ordered: Samples in ascending order
+    :type ordered: List[float]
+    :param q: Percentile, between 0 and 100
+    :type q: float
+    :rtype: float
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered), max(1, math.ceil(q / 100 * len(ordered)))) - 1]
+
+
+def _cpu_seconds() -> float:
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _start() -> Tuple[float, float]:
+    return time.perf_counter(), _cpu_seconds()
+
+
+def _elapsed(started: Tuple[float, float]) -> Tuple[float, float]:
+    return time.perf_counter() - started[0], _cpu_seconds() - started[1]
+
+
+def _interface(module, name: str, base: str, options: dict, transport):
+    api = getattr(module, name)("benchmark", transport=transport, **options)
+    api._hosts = {"partner": base, "steam": base}
+    return api
+
+
+def _run_sync(base: str, scenario: str, calls: int, concurrency: int, options: dict) -> tuple:
+    import steam_interfaces
+    name, method, arguments, _ = SCENARIOS[scenario]
+    call = getattr(_interface(steam_interfaces, name, base, options, steam_interfaces.Transport()), method)
+    call(*arguments(calls))
+    latencies = []
+    started = _start()
+    for i in range(calls):
+        start = time.perf_counter()
+        call(*arguments(i))
+        latencies.append(time.perf_counter() - start)
+    return latencies, _elapsed(started)
+
+
+def _run_threaded(base: str, scenario: str, calls: int, concurrency: int, options: dict) -> tuple:
+    import steam_interfaces
+    from concurrent.futures import ThreadPoolExecutor
+    name, method, arguments, _ = SCENARIOS[scenario]
+    transport = steam_interfaces.Transport(pool_maxsize=concurrency)
+    call = getattr(_interface(steam_interfaces, name, base, options, transport), method)
+
+    def timed(i: int) -> float:
+        start = time.perf_counter()
+        call(*arguments(i))
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(calls, calls + concurrency)))
+        started = _start()
+        latencies = list(executor.map(timed, range(calls)))
+        return latencies, _elapsed(started)
+
+
+def _run_async(base: str, scenario: str, calls: int, concurrency: int, options: dict) -> tuple:
+    import asyncio
+    from steam_interfaces import aio
+    name, method, arguments, _ = SCENARIOS[scenario]
+
+    async def main() -> tuple:
+        async with aio.AsyncTransport(limit=concurrency) as transport:
+            call = getattr(_interface(aio, name, base, options, transport), method)
+            await asyncio.gather(*(call(*arguments(i)) for i in range(calls, calls + concurrency)))
+            latencies = []
+            pending = iter(range(calls))
+
+            async def worker() -> None:
+                for i in pending:
+                    start = time.perf_counter()
+                    await call(*arguments(i))
+                    latencies.append(time.perf_counter() - start)
+
+            started = _start()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return latencies, _elapsed(started)
+
+    return asyncio.run(main())
+
+
+_RUNNERS = {"sync": _run_sync, "threaded": _run_threaded, "async": _run_async}
+
+
+def run_scenario(base: str, scenario: str, mode: str, calls: int, concurrency: int, options: dict) -> dict:
+    """
+    Run one scenario in this process, after one warm-up call per connection.
+
+    :param base: Base URL of the mock server
+    :type base: str
+    :param scenario: Name of the scenario, see :data:`SCENARIOS`
+    :type scenario: str
+    :param mode: "sync", "threaded" or "async"
+    :type mode: str
+    :param calls: Number of timed calls
+    :type calls: int
+    :param concurrency: Threads or tasks calling at once, ignored in sync mode
+    :type concurrency: int
+    :param options: Keyword options of the interface
+    :type options: dict
+    :return: Measurements
+    :rtype: dict
+    """
+    concurrency = 1 if mode == "sync" else concurrency
+    latencies, (wall, cpu) = _RUNNERS[mode](base, scenario, calls, concurrency, options)
+    latencies.sort()
+    return {
+        "scenario": scenario, "mode": mode, "calls": len(latencies), "concurrency": concurrency,
+        "seconds": round(wall, 4),
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "cpu_seconds": round(cpu, 4),
+        "cpu_ms_per_call": round(cpu / len(latencies) * 1000, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1) if resource is not None else None,
+    }
+
+
+def _options(args) -> dict:
+    # Every call must reach the server, so identical calls are not shared.
+    options = {"coalesce": False, "typed": args.typed}
+    if args.decoder == "orjson":
+        import orjson
+        options["decoder"] = orjson.loads
+    return options
+
+
+def _worker(args) -> None:
+    """Entry point of the interpreter running one scenario, prints its measurements."""
+    result = run_scenario(args.base, args.scenario, args.mode, args.calls, args.concurrency, _options(args))
+    print(json.dumps(result))
+
+
+class MockServer(object):
+    """The mock server of mock_steam.py, running in its own process."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        :param latency: Milliseconds added to every response
+        :type latency: float
+        """
+        self._latency = latency
+        self._process = None
+        self.base = None
+
+    def __enter__(self) -> "MockServer":
+        self._process = subprocess.Popen([sys.executable, os.path.join(_HERE, "mock_steam.py"),
+                                          "--latency", str(self._latency)],
+                                         stdout=subprocess.PIPE, universal_newlines=True)
+        self.base = self._process.stdout.readline().strip()
+        if not self.base:
+            self._process.kill()
+            raise RuntimeError("The mock server did not start!")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._process.terminate()
+        self._process.wait()
+
+
+def _measure(args, base: str, scenario: str, mode: str) -> dict:
+    calls = max(1, int(SCENARIOS[scenario][3] * args.scale))
+    command = [sys.executable, os.path.abspath(__file__), "--worker", "--base", base,
+               "--scenario", scenario, "--mode", mode, "--calls", str(calls),
+               "--concurrency", str(args.concurrency), "--decoder", args.decoder]
+    if args.typed:
+        command.append("--typed")
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+    if process.returncode != 0:
+        error = (process.stderr.strip().splitlines() or ["exit status %d" % process.returncode])[-1]
+        return {"scenario": scenario, "mode": mode, "error": error}
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """
+    Find the measurements that are worse than the baseline by more than the tolerance.
+
+    :param results: Results of this run
+    :type results: List[dict]
+    :param baseline: Results of the run compared to
+    :type baseline: List[dict]
+    :param tolerance: Accepted relative change, e.g. 0.1 for 10 %
+    :type tolerance: float
+    :return: One description per regression
+    :rtype: List[str]
+    """
+    previous = {(result["scenario"], result["mode"]): result for result in baseline if "error" not in result}
+    regressions = []
+    for result in results:
+        before = previous.get((result["scenario"], result["mode"]))
+        if before is None or "error" in result:
+            continue
+        for metric, higher_is_better in _COMPARED.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{result['scenario']}/{result['mode']}: {metric} {old} -> {new} "
+                                   f"({change:+.1%})")
+    return regressions
+
+
+def _print_table(results: List[dict]) -> None:
+    columns = ("rps", "p50_ms", "p99_ms", "cpu_ms_per_call", "peak_rss_mb")
+    print(f"{'scenario':<18}{'mode':<10}" + "".join(f"{column:>17}" for column in columns), file=sys.stderr)
+    for result in results:
+        head = f"{result['scenario']:<18}{result['mode']:<10}"
+        if "error" in result:
+            print(head + "  " + result["error"], file=sys.stderr)
+        else:
+            print(head + "".join(f"{result[column]!s:>17}" for column in columns), file=sys.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma separated scenarios, from: " + ", ".join(SCENARIOS))
+    parser.add_argument("--modes", default=",".join(MODES), help="comma separated modes, from: " + ", ".join(MODES))
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the number of calls of every scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="threads or tasks of the concurrent modes")
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds the server adds to every response")
+    parser.add_argument("--decoder", choices=("json", "orjson"), default="json")
+    parser.add_argument("--typed", action="store_true", help="create the interfaces with typed=True")
+    parser.add_argument("--output", help="write the results to this JSON file instead of stdout")
+    parser.add_argument("--baseline", help="results of a previous run to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="accepted relative regression")
+    # Options of the interpreters running a single scenario.
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base", help=argparse.SUPPRESS)
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--calls", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        _worker(args)
+        return 0
+
+    scenarios, modes = args.scenarios.split(","), args.modes.split(",")
+    for name in scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+    for name in modes:
+        if name not in MODES:
+            parser.error(f"unknown mode {name!r}")
+
+    import steam_interfaces
+    results = []
+    with MockServer(args.latency) as server:
+        for scenario in scenarios:
+            for mode in modes:
+                results.append(_measure(args, server.base, scenario, mode))
+    _print_table(results)
+
+    report = {
+        "meta": {
+            "steam_interfaces": steam_interfaces.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "scale": args.scale, "concurrency": args.concurrency, "latency_ms": args.latency,
+            "decoder": args.decoder, "typed": args.typed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    failed = [result for result in results if "error" in result]
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for setting in ("scale", "concurrency", "latency_ms", "decoder", "typed", "cpus"):
+            if baseline["meta"].get(setting) != report["meta"][setting]:
+                print(f"warning: the baseline was run with {setting}={baseline['meta'].get(setting)!r}",
+                      file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print("regression: " + regression, file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,10 @@ setup(
 
     packages=['steam_interfaces'],
     install_requires=['requests'],
+    extras_require={
+        'async': ['aiohttp'],
+        'numpy': ['numpy'],
+    },
 
     classifiers=[
         'License :: OSI Approved :: MIT License',
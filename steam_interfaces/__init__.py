@@ -3,8 +3,82 @@
 :license: MIT License, see LICENSE file
 :copyright: (c) 2023 Tarodictrl
 """
+import sys
+from importlib import import_module
 
-from .__main__ import *
+# Public names and the submodule defining them. Submodules are imported on first access,
+# so importing the package stays cheap and ``requests`` is only loaded by the first request.
+_EXPORTS = {
+    "IBroadcastService": "interfaces",
+    "ICheatReportingService": "interfaces",
+    "IDOTA2Fantasy_570": "interfaces",
+    "IDOTA2MatchStats_570": "interfaces",
+    "IDOTA2Match_570": "interfaces",
+    "IDOTA2StreamSystem_205790": "interfaces",
+    "IDOTAChat_570": "interfaces",
+    "IEconMarketService": "interfaces",
+    "ILobbyMatchmakingService": "interfaces",
+    "IPlayerService": "interfaces",
+    "ISiteLicenseService": "interfaces",
+    "ISteamApps": "interfaces",
+    "ISteamCommunity": "interfaces",
+    "ISteamGameServerStats": "interfaces",
+    "ISteamNews": "interfaces",
+    "ISteamUser": "interfaces",
+    "ISteamWebAPIUtil": "interfaces",
+    "IWorkshopService": "interfaces",
+    "DEFAULT_RETRY": "api",
+    "MAX_IDS_PER_REQUEST": "api",
+    "AppCatalogue": "apps",
+    "AppTable": "apps",
+    "MemoryCache": "cache",
+    "SQLiteCache": "cache",
+    "FileCheckpoint": "checkpoint",
+    "RequestGroup": "coalesce",
+    "KeyPool": "keys",
+    "KeyPoolExhausted": "keys",
+    "BatchLoader": "loader",
+    "PlayerLoader": "loader",
+    "CallRecord": "metrics",
+    "Metrics": "metrics",
+    "Match": "models",
+    "MatchPlayer": "models",
+    "OwnedGame": "models",
+    "PlayerBans": "models",
+    "PlayerSummary": "models",
+    "OwnershipIndex": "ownership",
+    "OwnershipStore": "ownership",
+    "OwnershipSync": "ownership",
+    "OwnershipSyncError": "ownership",
+    "RateLimitExceeded": "ratelimit",
+    "TokenBucket": "ratelimit",
+    "AIMDLimiter": "retry",
+    "Retry": "retry",
+    "SubmissionFailed": "submissions",
+    "SubmissionQueue": "submissions",
+    "Transport": "transport",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ needs Python 3.7; load everything up front instead.
+    for _name in _EXPORTS:
+        __getattr__(_name)
 
 
 __author__ = "Tarodictrl"
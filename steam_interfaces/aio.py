@@ -0,0 +1,404 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import asyncio
+import json
+from typing import Callable, Iterator, List, Tuple, Union
+
+import aiohttp
+
+from . import interfaces as _sync
+from .api import MAX_IDS_PER_REQUEST, _merge_responses, _SteamAPI
+from .feeds import aiter_deleted_steam_ids, aiter_match_history, aiter_match_sequence
+from .keys import KeyPool, KeyPoolExhausted
+from .loader import AsyncPlayerLoader
+from .metrics import CallRecord
+from .models import typed_response
+from .ratelimit import RateLimitExceeded
+from .reports import aiter_cheating_reports, awrite_ndjson
+
+
+def _encode_params(params: dict) -> List[Tuple[str, str]]:
+    """
+    Encode query parameters the same way requests does.
+
+    None values are dropped and lists are sent as repeated keys.
+
+    :param params: Steam API parameters
+    :type params: dict
+    :return: Query string pairs
+    :rtype: List[Tuple[str, str]]
+    """
+    query = []
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            query.extend((name, str(item)) for item in value)
+        else:
+            query.append((name, str(value)))
+    return query
+
+
+class AsyncResponse(object):
+    """Fully read HTTP response returned by :class:`AsyncTransport`."""
+
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(self, status_code: int, headers, content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncTransport(object):
+    """
+    Connection-pooled asyncio HTTP transport for the Steam API.
+
+    Any number of coroutines may issue requests at once; they queue for one of
+    ``limit`` keep-alive connections instead of opening a connection each.
+    """
+
+    # Errors raised when no response was received.
+    errors = (aiohttp.ClientError, asyncio.TimeoutError)
+
+    _default = None
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 keepalive_timeout: float = 15.0,
+                 timeout: Union[float, None] = None) -> None:
+        """
+        :param limit: Maximum number of simultaneous connections
+        :type limit: int
+        :param limit_per_host: Maximum number of simultaneous connections to a single host, 0 for no limit
+        :type limit_per_host: int
+        :param keepalive_timeout: Seconds an idle connection is kept open
+        :type keepalive_timeout: float
+        :param timeout: Total timeout in seconds of every request
+        :type timeout: float
+        """
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._sessions = {}
+        self._closers = {}
+
+    @classmethod
+    def default(cls) -> "AsyncTransport":
+        """
+        Return the process-wide transport used by async interfaces created without one.
+
+        :return: Shared transport
+        :rtype: AsyncTransport
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Client session bound to the running event loop, closed when the loop shuts down."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            for other in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[other], self._closers[other]
+            connector = aiohttp.TCPConnector(limit=self._limit,
+                                             limit_per_host=self._limit_per_host,
+                                             keepalive_timeout=self._keepalive_timeout)
+            session = self._sessions[loop] = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+            # asyncio.run() closes the async generators started on its loop before closing the loop,
+            # so starting one here lets the session close its connections on the loop that owns them.
+            closer = self._closers[loop] = self._close_on_shutdown(loop, session)
+            try:
+                closer.asend(None).send(None)
+            except StopIteration:
+                pass
+        return session
+
+    async def _close_on_shutdown(self, loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession):
+        try:
+            yield
+        finally:
+            if self._sessions.get(loop) is session:
+                del self._sessions[loop], self._closers[loop]
+            await session.close()
+
+    async def request(self, http_method: str, url: str, params: dict) -> AsyncResponse:
+        """
+        Send a request through the pool.
+
+        :param http_method: HTTP method
+        :type http_method: str
+        :param url: Request URL
+        :type url: str
+        :param params: Query string parameters
+        :type params: dict
+        :return: HTTP response
+        :rtype: AsyncResponse
+        """
+        async with self.session.request(http_method, url, params=_encode_params(params)) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, response.headers, content)
+
+    async def close(self) -> None:
+        """Close every pooled connection of the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        self._closers.pop(loop, None)
+        if session is not None:
+            await session.close()
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+class _AsyncSteamAPI(_SteamAPI):
+    """Class for interacting with the Steam API from asyncio code."""
+
+    def __init__(self, key: Union[str, KeyPool, None], transport: AsyncTransport = None, **kwargs) -> None:
+        """
+        :param key: Steam API key, or a KeyPool to spread requests over several keys
+        :type key: Union[str, KeyPool]
+        :param transport: Pooled asyncio HTTP transport, the process-wide default is used otherwise.
+        :type transport: AsyncTransport
+        """
+        super().__init__(key, transport=transport or AsyncTransport.default(), **kwargs)
+
+    async def _pick_key(self, wait: float = 0.0) -> tuple:
+        if isinstance(self._key, KeyPool):
+            while True:
+                try:
+                    key = self._key.acquire()
+                    break
+                except KeyPoolExhausted:
+                    delay = self._key.available_in()
+                    if delay is None or not wait:
+                        raise
+                    if delay > wait:
+                        # A retry goes out like it would with a single key, with the first key back.
+                        key = self._key.acquire(benched=True)
+                        break
+                    await asyncio.sleep(delay)
+                    wait -= delay
+            return key, self._key.rate_limiter(key)
+        return self._key, self._rate_limiter
+
+    async def _send_once(self, http_method: str, url: str, params: dict, wait: float = 0.0) -> AsyncResponse:
+        response = None
+        tries = len(self._key) if isinstance(self._key, KeyPool) else 1
+        for tried in range(1, tries + 1):
+            key, rate_limiter = await self._pick_key(wait if tried == 1 else 0.0)
+            if rate_limiter is not None and not await rate_limiter.acquire_async(self._rate_limit_blocking):
+                self._release_key(key, None)
+                raise RateLimitExceeded("Rate limit exceeded!")
+            params["key"] = key
+            token = await self._adaptive_concurrency.acquire_async() if self._adaptive_concurrency is not None else None
+            response = None
+            try:
+                response = await self._transport.request(http_method, url, params)
+            finally:
+                if token is not None:
+                    self._adaptive_concurrency.release(token, self._is_congested(response))
+                rejected = self._release_key(key, response)
+            if not rejected:
+                break
+        return response
+
+    async def _send(self, http_method: str, url: str, params: dict, call: CallRecord = None) -> AsyncResponse:
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await self._send_once(http_method, url, params,
+                                                 self._retry.max_backoff if attempt else 0.0)
+            except self._transport.errors as exc:
+                error = exc
+            if self._retry is None or not self._retry.is_retryable(attempt, http_method, response, error):
+                if call is not None:
+                    self._record_response(call, response, attempt)
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(self._retry.backoff(attempt, response))
+            attempt += 1
+
+    async def _get(self, host: str, interface: str, method: str, version: int, params: dict) -> dict:
+        call = self._start_call(interface, method, "GET")
+        try:
+            key, ttl, result = self._cache_lookup(host, interface, method, version, params)
+            if result is None and self._coalesce is None:
+                result = await self._fetch(host, interface, method, version, params, key, ttl, call)
+            elif result is None:
+                result = await self._coalesce.do_async(self._coalesce_key(host, interface, method, version, params),
+                                                       lambda: self._fetch(host, interface, method, version, params,
+                                                                           key, ttl, call))
+                if call is not None and call.status is None:
+                    call.coalesced = True
+            elif call is not None:
+                call.cache_hit = True
+        except Exception as error:
+            self._finish_call(call, error)
+            raise
+        self._finish_call(call)
+        return typed_response(interface, method, result) if self._typed else result
+
+    async def _fetch(self,
+                     host: str,
+                     interface: str,
+                     method: str,
+                     version: int,
+                     params: dict,
+                     key: tuple,
+                     ttl: float,
+                     call: CallRecord = None):
+        url = self._build_url(host, interface, method, version)
+        response = await self._send("GET", url, params, call)
+        result = self._handle_response(response, "Invalid API key or access denied!")
+        self._cache_store(key, ttl, result)
+        return result
+
+    async def _get_chunked(self,
+                           host: str,
+                           interface: str,
+                           method: str,
+                           version: int,
+                           params: dict,
+                           field: str,
+                           values: list,
+                           chunk_size: int = MAX_IDS_PER_REQUEST) -> dict:
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def fetch(chunk):
+            async with semaphore:
+                return await self._get(host, interface, method, version, chunk)
+
+        chunks = self._chunk_params(params, field, values, chunk_size)
+        responses = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return responses if self._raw else _merge_responses(responses)
+
+    async def _get_streamed(self,
+                            host: str,
+                            interface: str,
+                            method: str,
+                            version: int,
+                            params: dict,
+                            parse: Callable[[Iterator[bytes]], object]):
+        # The body is already read by AsyncTransport, only the decoded JSON is avoided.
+        call = self._start_call(interface, method, "GET")
+        try:
+            url = self._build_url(host, interface, method, version)
+            response = await self._send("GET", url, params, call)
+            if response.status_code == 200:
+                result = parse(iter((response.content,)))
+            else:
+                result = self._handle_response(response, "Invalid API key or access denied!")
+        except Exception as error:
+            self._finish_call(call, error)
+            raise
+        self._finish_call(call)
+        return result
+
+    async def _post(self, host: str, interface: str, method: str, version: int, params: dict) -> dict:
+        call = self._start_call(interface, method, "POST")
+        try:
+            url = self._build_url(host, interface, method, version)
+            response = await self._send("POST", url, params, call)
+            result = self._handle_response(response, "Invalid API key")
+        except Exception as error:
+            self._finish_call(call, error)
+            raise
+        self._finish_call(call)
+        return result
+
+
+class IBroadcastService(_sync.IBroadcastService, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IBroadcastService`."""
+
+
+class ICheatReportingService(_sync.ICheatReportingService, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ICheatReportingService`. Its iterators are async iterators."""
+
+    _iter_cheating_reports = staticmethod(aiter_cheating_reports)
+    _write_ndjson = staticmethod(awrite_ndjson)
+
+
+class ISteamUser(_sync.ISteamUser, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ISteamUser`. Its iterators are async iterators."""
+
+    _iter_deleted_steam_ids = staticmethod(aiter_deleted_steam_ids)
+    _player_loader = AsyncPlayerLoader
+
+
+class IDOTAChat_570(_sync.IDOTAChat_570, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IDOTAChat_570`."""
+
+
+class IDOTA2MatchStats_570(_sync.IDOTA2MatchStats_570, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IDOTA2MatchStats_570`."""
+
+
+class IDOTA2Fantasy_570(_sync.IDOTA2Fantasy_570, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IDOTA2Fantasy_570`."""
+
+
+class IDOTA2StreamSystem_205790(_sync.IDOTA2StreamSystem_205790, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IDOTA2StreamSystem_205790`."""
+
+
+class IPlayerService(_sync.IPlayerService, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IPlayerService`."""
+
+
+class ISteamApps(_sync.ISteamApps, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ISteamApps`."""
+
+
+class ISteamNews(_sync.ISteamNews, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ISteamNews`."""
+
+
+class IWorkshopService(_sync.IWorkshopService, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IWorkshopService`."""
+
+
+class ISteamGameServerStats(_sync.ISteamGameServerStats, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ISteamGameServerStats`."""
+
+
+class ISteamWebAPIUtil(_sync.ISteamWebAPIUtil, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ISteamWebAPIUtil`."""
+
+
+class IEconMarketService(_sync.IEconMarketService, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IEconMarketService`."""
+
+
+class ILobbyMatchmakingService(_sync.ILobbyMatchmakingService, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ILobbyMatchmakingService`."""
+
+
+class ISiteLicenseService(_sync.ISiteLicenseService, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ISiteLicenseService`."""
+
+
+class ISteamCommunity(_sync.ISteamCommunity, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.ISteamCommunity`."""
+
+
+class IDOTA2Match_570(_sync.IDOTA2Match_570, _AsyncSteamAPI):
+    """Async :class:`steam_interfaces.IDOTA2Match_570`. Its iterators are async iterators."""
+
+    _iter_match_history = staticmethod(aiter_match_history)
+    _iter_match_sequence = staticmethod(aiter_match_sequence)
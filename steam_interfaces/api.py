@@ -0,0 +1,547 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import time
+from typing import Callable, Iterator, List, Union
+
+from .cache import MemoryCache, SQLiteCache, cache_key
+from .coalesce import RequestGroup
+from .keys import KeyPool, KeyPoolExhausted
+from .metrics import CallRecord, Metrics
+from .models import typed_response
+from .ratelimit import RateLimitExceeded, TokenBucket
+from .retry import CONGESTION_STATUSES, AIMDLimiter, Retry, parse_retry_after
+from .transport import Transport
+
+__all__ = [
+    "DEFAULT_RETRY",
+    "MAX_IDS_PER_REQUEST",
+]
+
+# Largest number of comma separated IDs the list endpoints accept in one call.
+MAX_IDS_PER_REQUEST = 100
+
+DEFAULT_RETRY = Retry()
+
+
+def _chunks(values: list, size: int) -> List[list]:
+    """Split a list into consecutive pieces of at most ``size`` items."""
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def _merge_responses(responses: List[dict]) -> Union[dict, None]:
+    """
+    Merge the responses of a chunked request into one response of the same shape.
+
+    Lists are concatenated, dicts are merged key by key and other values keep
+    their first occurrence. Chunks that failed (None) are skipped.
+    The chunk responses themselves are left untouched.
+
+    :param responses: Responses in request order
+    :type responses: List[dict]
+    :return: Merged response
+    :rtype: dict
+    """
+    def merge(left, right):
+        if isinstance(left, dict) and isinstance(right, dict):
+            merged = dict(left)
+            for name, value in right.items():
+                merged[name] = merge(left[name], value) if name in left else value
+            return merged
+        if isinstance(left, list) and isinstance(right, list):
+            return left + right
+        return left
+
+    merged = None
+    for response in responses:
+        if response is not None:
+            merged = response if merged is None else merge(merged, response)
+    return merged
+
+
+class _SteamAPI(object):
+    """Class for interacting with the Steam API."""
+
+    _hosts = {
+        "partner": "https://partner.steam-api.com",
+        "steam": "https://api.steampowered.com"
+    }
+
+    def __init__(self,
+                 key: Union[str, KeyPool, None],
+                 transport: Transport = None,
+                 concurrency: int = 4,
+                 cache: MemoryCache = None,
+                 persistent_cache: SQLiteCache = None,
+                 rate_limit: Union[float, TokenBucket] = None,
+                 rate_limit_blocking: bool = True,
+                 retry: Union[Retry, None] = DEFAULT_RETRY,
+                 adaptive_concurrency: AIMDLimiter = None,
+                 coalesce: Union[bool, RequestGroup] = True,
+                 typed: bool = False,
+                 decoder: Callable[[bytes], object] = None,
+                 raw: bool = False,
+                 metrics: Union[bool, Metrics, Callable[[CallRecord], None]] = None) -> None:
+        """
+        :param key: Steam API key, or a KeyPool to spread requests over several keys
+        :type key: Union[str, KeyPool]
+        :param transport: Pooled HTTP transport. Pass the same transport to several interfaces
+        to share their connections; the process-wide default transport is used otherwise.
+        :type transport: Transport
+        :param concurrency: Maximum number of requests a single call may run in parallel,
+        e.g. the chunks of a long list of Steam IDs
+        :type concurrency: int
+        :param cache: Response cache for GET requests. Can be shared by several interfaces.
+        :type cache: MemoryCache
+        :param persistent_cache: On-disk cache of immutable responses, such as finished match details.
+        Can be shared by several interfaces and processes.
+        :type persistent_cache: SQLiteCache
+        :param rate_limit: Requests per second allowed for this API key, shared by every interface
+        created with the same key, or an explicit TokenBucket. Ignored for a KeyPool,
+        which limits each of its keys itself.
+        :type rate_limit: Union[float, TokenBucket]
+        :param rate_limit_blocking: Wait for the rate limiter instead of raising RateLimitExceeded
+        :type rate_limit_blocking: bool
+        :param retry: Retry policy for throttled and failed requests, None to never retry
+        :type retry: Retry
+        :param adaptive_concurrency: Concurrency limit that adapts to 429 and 5xx responses.
+        Share one between the interfaces of a bulk job.
+        :type adaptive_concurrency: AIMDLimiter
+        :param coalesce: Share one request and its decoded response among identical GET requests in flight
+        at the same time. True uses a process-wide group, False disables it.
+        :type coalesce: Union[bool, RequestGroup]
+        :param typed: Return the records of GetPlayerSummaries, GetPlayerBans, GetOwnedGames and GetMatchDetails
+        as slot-based models (see :mod:`steam_interfaces.models`) instead of dicts
+        :type typed: bool
+        :param decoder: Decodes response bodies instead of the standard library JSON decoder, e.g. ``orjson.loads``
+        :type decoder: Callable[[bytes], object]
+        :param raw: Return the undecoded response bodies. Caches and typed models are not used,
+        and methods that split long lists return one body per chunk.
+        :type raw: bool
+        :param metrics: Called with a :class:`steam_interfaces.metrics.CallRecord` at the end of every call,
+        e.g. a Metrics aggregating them. True uses the process-wide Metrics.
+        :type metrics: Union[bool, Metrics, Callable[[CallRecord], None]]
+        """
+        self._url = "https://partner.steam-api.com/{0}/{1}/v{2}/"
+        self._key = key
+        self._transport = transport or Transport.default()
+        self._concurrency = concurrency
+        self._cache = cache
+        self._persistent_cache = persistent_cache
+        if isinstance(key, KeyPool):
+            rate_limit = None
+        elif isinstance(rate_limit, (int, float)):
+            rate_limit = TokenBucket.for_key(key, rate_limit)
+        self._rate_limiter = rate_limit
+        self._rate_limit_blocking = rate_limit_blocking
+        self._retry = retry
+        self._adaptive_concurrency = adaptive_concurrency
+        if coalesce is True:
+            coalesce = RequestGroup.default()
+        elif coalesce is False:
+            coalesce = None
+        self._coalesce = coalesce
+        self._typed = typed and not raw
+        self._decoder = decoder
+        self._raw = raw
+        if metrics is True:
+            metrics = Metrics.default()
+        elif metrics is False:
+            metrics = None
+        self._metrics = metrics
+
+    def _build_url(self, host: str, interface: str, method: str, version: int) -> str:
+        """
+        Build the URL of a Steam API method.
+
+        :param host: Steam API host, "partner" or "steam"
+        :type host: str
+        :param interface: Steam API interface
+        :type interface: str
+        :param method: Steam API method
+        :type method: str
+        :param version: Steam API version
+        :type version: int
+        :return: Method URL
+        :rtype: str
+        """
+        if host not in self._hosts:
+            raise ValueError("Invalid host!")
+        return f"{self._hosts[host]}/{interface}/{method}/v{version}/"
+
+    def _require_decoded(self, helper: str) -> None:
+        """
+        Refuse to run a helper that reads the responses on an interface in raw mode.
+
+        :param helper: Name of the helper
+        :type helper: str
+        """
+        if self._raw:
+            raise ValueError(f"{helper} needs decoded responses, create the interface without raw=True!")
+
+    def _handle_response(self, response, denied_message: str) -> dict:
+        """
+        Decode a Steam API response.
+
+        :param response: HTTP response
+        :param denied_message: Error message raised on 403
+        :type denied_message: str
+        :return: Steam API response, its body in raw mode
+        :rtype: dict
+        """
+        if response.status_code == 200:
+            if self._raw:
+                return response.content
+            if self._decoder is not None:
+                return self._decoder(response.content)
+            return response.json()
+        elif response.status_code == 403:
+            raise ValueError(denied_message)
+
+    def _pick_key(self, wait: float = 0.0) -> tuple:
+        """
+        Choose the API key of the next request.
+
+        :param wait: Longest time in seconds to wait for a key of the pool to be back in rotation,
+        after which the key whose cooldown ends first is used. 0 to raise KeyPoolExhausted at once.
+        :type wait: float
+        :return: API key and its rate limiter
+        :rtype: tuple
+        """
+        if isinstance(self._key, KeyPool):
+            while True:
+                try:
+                    key = self._key.acquire()
+                    break
+                except KeyPoolExhausted:
+                    delay = self._key.available_in()
+                    if delay is None or not wait:
+                        raise
+                    if delay > wait:
+                        # A retry goes out like it would with a single key, with the first key back.
+                        key = self._key.acquire(benched=True)
+                        break
+                    time.sleep(delay)
+                    wait -= delay
+            return key, self._key.rate_limiter(key)
+        return self._key, self._rate_limiter
+
+    def _release_key(self, key: str, response) -> bool:
+        """
+        Report the outcome of a request to the key pool.
+
+        :return: Whether the key was taken out of rotation and the request should go out with another one
+        :rtype: bool
+        """
+        if not isinstance(self._key, KeyPool):
+            return False
+        status_code = response.status_code if response is not None else None
+        self._key.release(key, status_code, parse_retry_after(response))
+        return status_code in self._key.bench_statuses
+
+    @staticmethod
+    def _is_congested(response) -> bool:
+        """Return whether a response, None for a failed request, signals that the server is overloaded."""
+        return response is None or response.status_code in CONGESTION_STATUSES
+
+    def _send_once(self, http_method: str, url: str, params: dict, stream: bool = False, wait: float = 0.0):
+        """
+        Send a request with the API key once the rate limiter and the concurrency limit allow it.
+        With a KeyPool, a request rejected by one key is sent again with the next one.
+
+        :param http_method: HTTP method
+        :type http_method: str
+        :param url: Method URL
+        :type url: str
+        :param params: Steam API parameters
+        :type params: dict
+        :param stream: Return before the response body is read
+        :type stream: bool
+        :param wait: Longest time in seconds to wait for a key of the pool to be back in rotation
+        :type wait: float
+        :return: HTTP response
+        """
+        response = None
+        tries = len(self._key) if isinstance(self._key, KeyPool) else 1
+        for tried in range(1, tries + 1):
+            key, rate_limiter = self._pick_key(wait if tried == 1 else 0.0)
+            if rate_limiter is not None and not rate_limiter.acquire(self._rate_limit_blocking):
+                self._release_key(key, None)
+                raise RateLimitExceeded("Rate limit exceeded!")
+            params["key"] = key
+            token = self._adaptive_concurrency.acquire() if self._adaptive_concurrency is not None else None
+            response = None
+            try:
+                response = self._transport.request(http_method, url, params, stream=stream)
+            finally:
+                if token is not None:
+                    self._adaptive_concurrency.release(token, self._is_congested(response))
+                rejected = self._release_key(key, response)
+            if not rejected or tried == tries:
+                break
+            # Hand the connection back to the pool before sending the request with the next key.
+            response.close()
+        return response
+
+    def _send(self, http_method: str, url: str, params: dict, stream: bool = False, call: CallRecord = None):
+        """
+        Send a request, retrying it according to the retry policy.
+
+        :param http_method: HTTP method
+        :type http_method: str
+        :param url: Method URL
+        :type url: str
+        :param params: Steam API parameters
+        :type params: dict
+        :param stream: Return before the response body is read
+        :type stream: bool
+        :param call: Record of the call the request belongs to, None without metrics
+        :type call: CallRecord
+        :return: HTTP response
+        """
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                # A retry waits for the keys its previous attempt took out of rotation.
+                response = self._send_once(http_method, url, params, stream,
+                                           self._retry.max_backoff if attempt else 0.0)
+            except self._transport.errors as exc:
+                error = exc
+            if self._retry is None or not self._retry.is_retryable(attempt, http_method, response, error):
+                if call is not None:
+                    self._record_response(call, response, attempt, stream)
+                if error is not None:
+                    raise error
+                return response
+            delay = self._retry.backoff(attempt, response)
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _record_response(call: CallRecord, response, retries: int, stream: bool = False) -> None:
+        """Copy the outcome of the last request of a call to its record."""
+        call.retries = retries
+        if response is not None:
+            call.status = response.status_code
+            if stream:
+                call.bytes = int(response.headers.get("Content-Length") or 0)
+            else:
+                call.bytes = len(response.content)
+
+    def _start_call(self, interface: str, method: str, http_method: str) -> Union[CallRecord, None]:
+        """Start the record of a call, None without metrics."""
+        if self._metrics is None:
+            return None
+        return CallRecord(interface, method, http_method)
+
+    def _finish_call(self, call: Union[CallRecord, None], error: BaseException = None) -> None:
+        """Hand the record of a finished call to the metrics callback."""
+        if call is None:
+            return
+        call.seconds = time.perf_counter() - call.started
+        if error is not None:
+            call.error = type(error).__name__
+        self._metrics(call)
+
+    def _cache_lookup(self, host: str, interface: str, method: str, version: int, params: dict) -> tuple:
+        """
+        Look a GET request up in the memory cache, then in the persistent cache.
+
+        :return: Cache key, time to live and cached response. The key is None if the method is not cached.
+        :rtype: tuple
+        """
+        if self._raw:
+            return None, None, None
+        ttl = self._cache.ttl_for(interface, method) if self._cache is not None else None
+        persistent = self._persistent_cache is not None and self._persistent_cache.is_cached(interface, method)
+        if ttl is None and not persistent:
+            return None, None, None
+        key = cache_key(host, interface, method, version, params)
+        cached = self._cache.get(key) if ttl is not None else None
+        if cached is None and persistent:
+            cached = self._persistent_cache.get(key)
+        return key, ttl, cached
+
+    def _cache_store(self, key: tuple, ttl: float, result: dict) -> None:
+        """Store a successful response under a key returned by :meth:`_cache_lookup`."""
+        if key is None or result is None:
+            return
+        if ttl is not None:
+            self._cache.set(key, result, ttl)
+        if self._persistent_cache is not None and self._persistent_cache.is_cached(key[1], key[2]):
+            self._persistent_cache.set(key, result)
+
+    def _get(self, host: str, interface: str, method: str, version: int, params: dict) -> dict:
+        """
+        Send a GET request to the Steam API.
+
+        :param interface: Steam API interface
+        :type interface: str
+        :param method: Steam API method
+        :type method: str
+        :param version: Steam API version
+        :type version: int
+        :param params: Steam API parameters
+        :type params: dict
+        :return: Steam API response
+        :rtype: dict
+        """
+        call = self._start_call(interface, method, "GET")
+        try:
+            key, ttl, result = self._cache_lookup(host, interface, method, version, params)
+            if result is None and self._coalesce is None:
+                result = self._fetch(host, interface, method, version, params, key, ttl, call)
+            elif result is None:
+                result = self._coalesce.do(self._coalesce_key(host, interface, method, version, params),
+                                           lambda: self._fetch(host, interface, method, version, params, key, ttl,
+                                                               call))
+                # Only the call that sent the request has its response.
+                if call is not None and call.status is None:
+                    call.coalesced = True
+            elif call is not None:
+                call.cache_hit = True
+        except Exception as error:
+            self._finish_call(call, error)
+            raise
+        self._finish_call(call)
+        # Caches and coalesced callers share the decoded response, every caller gets its own models.
+        return typed_response(interface, method, result) if self._typed else result
+
+    def _coalesce_key(self, host: str, interface: str, method: str, version: int, params: dict) -> tuple:
+        """
+        Build the key identifying identical GET requests.
+        Requests made with different API keys are never shared, as their access may differ,
+        nor are requests decoded differently.
+
+        :rtype: tuple
+        """
+        api_key = self._key if isinstance(self._key, str) else id(self._key)
+        return api_key, self._raw, self._decoder, cache_key(host, interface, method, version, params)
+
+    def _fetch(self,
+               host: str,
+               interface: str,
+               method: str,
+               version: int,
+               params: dict,
+               key: tuple,
+               ttl: float,
+               call: CallRecord = None):
+        """
+        Send a GET request that missed the caches and store its response.
+
+        :param key: Cache key, None if the method is not cached
+        :type key: tuple
+        :param ttl: Time to live in the memory cache
+        :type ttl: float
+        :param call: Record of the call, None without metrics
+        :type call: CallRecord
+        :return: Steam API response
+        :rtype: dict
+        """
+        url = self._build_url(host, interface, method, version)
+        response = self._send("GET", url, params, call=call)
+        result = self._handle_response(response, "Invalid API key or access denied!")
+        self._cache_store(key, ttl, result)
+        return result
+
+    def _get_streamed(self,
+                      host: str,
+                      interface: str,
+                      method: str,
+                      version: int,
+                      params: dict,
+                      parse: Callable[[Iterator[bytes]], object]):
+        """
+        Send a GET request and hand the response body to ``parse`` piece by piece,
+        without holding the whole body or its decoded JSON in memory. Caches are not used.
+
+        :param parse: Builds the result from the body chunks
+        :type parse: Callable[[Iterator[bytes]], object]
+        :return: Result of ``parse``, None if the request failed
+        """
+        call = self._start_call(interface, method, "GET")
+        try:
+            url = self._build_url(host, interface, method, version)
+            response = self._send("GET", url, params, stream=True, call=call)
+            try:
+                if response.status_code == 200:
+                    result = parse(response.iter_content(chunk_size=65536))
+                else:
+                    result = self._handle_response(response, "Invalid API key or access denied!")
+            finally:
+                response.close()
+        except Exception as error:
+            self._finish_call(call, error)
+            raise
+        self._finish_call(call)
+        return result
+
+    @staticmethod
+    def _chunk_params(params: dict, field: str, values: list, chunk_size: int) -> List[dict]:
+        """Build one copy of ``params`` per chunk of ``values`` joined into ``field``."""
+        return [dict(params, **{field: ",".join(str(value) for value in chunk)})
+                for chunk in _chunks(values, chunk_size)] or [dict(params, **{field: ""})]
+
+    def _get_chunked(self,
+                     host: str,
+                     interface: str,
+                     method: str,
+                     version: int,
+                     params: dict,
+                     field: str,
+                     values: list,
+                     chunk_size: int = MAX_IDS_PER_REQUEST) -> dict:
+        """
+        Send a GET request whose ``field`` is a comma separated list, split into chunks
+        the endpoint accepts. Chunks are fetched in parallel and merged into one response.
+
+        :param field: Name of the list parameter
+        :type field: str
+        :param values: List parameter values
+        :type values: list
+        :param chunk_size: Maximum number of values per request
+        :type chunk_size: int
+        :return: Steam API response. In raw mode, the list of chunk bodies, even when there is a single chunk
+        :rtype: dict
+        """
+        chunks = self._chunk_params(params, field, values, chunk_size)
+        if len(chunks) == 1:
+            response = self._get(host, interface, method, version, chunks[0])
+            return [response] if self._raw else response
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(self._concurrency, len(chunks))) as executor:
+            responses = list(executor.map(lambda chunk: self._get(host, interface, method, version, chunk),
+                                          chunks))
+        return responses if self._raw else _merge_responses(responses)
+
+    def _post(self, host: str, interface: str, method: str, version: int, params: dict) -> dict:
+        """
+        Send a POST request to the Steam API.
+
+        :param interface: Steam API interface
+        :type interface: str
+        :param method: Steam API method
+        :type method: str
+        :param version: Steam API version
+        :type version: int
+        :param params: Steam API parameters
+        :type params: dict
+        :return: Steam API response
+        :rtype: dict
+        """
+        call = self._start_call(interface, method, "POST")
+        try:
+            url = self._build_url(host, interface, method, version)
+            response = self._send("POST", url, params, call=call)
+            result = self._handle_response(response, "Invalid API key")
+        except Exception as error:
+            self._finish_call(call, error)
+            raise
+        self._finish_call(call)
+        return result
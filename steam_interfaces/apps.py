@@ -0,0 +1,449 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import codecs
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable, Iterator, List, Tuple, Union
+
+_APP_START = '{"appid"'
+_decoder = json.JSONDecoder()
+
+# Snapshot layout: header, then app IDs, name offsets, name order (uint32 arrays) and the names.
+_SNAPSHOT_MAGIC = b"SIAPPS1\0"
+_SNAPSHOT_HEADER = struct.Struct("=8sII")
+
+
+def iter_apps(chunks: Iterable[bytes]) -> Iterator[Tuple[int, str]]:
+    """
+    Parse a GetAppList response incrementally.
+
+    Only one chunk and the app being parsed are held in memory, never the whole document.
+
+    :param chunks: Response body in pieces
+    :type chunks: Iterable[bytes]
+    :return: Iterator of (appid, name) pairs
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    for chunk in chunks:
+        buffer += text.decode(chunk)
+        position = 0
+        while True:
+            start = buffer.find(_APP_START, position)
+            if start < 0:
+                # Keep a tail long enough to hold a split marker.
+                position = max(position, len(buffer) - len(_APP_START))
+                break
+            try:
+                app, end = _decoder.raw_decode(buffer, start)
+            except ValueError:
+                # The app continues in the next chunk.
+                position = start
+                break
+            yield app["appid"], app.get("name", "")
+            position = end
+        buffer = buffer[position:]
+
+
+class AppTable(object):
+    """
+    Compact, read-only table of Steam applications.
+
+    App IDs, name offsets and a name sort order are kept in flat unsigned int arrays and
+    all names in one UTF-8 buffer, a small fraction of the memory of the decoded JSON.
+    Lookups by app ID and by name are binary searches.
+    """
+
+    __slots__ = ("_appids", "_offsets", "_names", "_order")
+
+    def __init__(self, appids, offsets, names, order=None) -> None:
+        """
+        :param appids: App IDs in ascending order
+        :param offsets: Start of every name in ``names``, plus the end of the last one
+        :param names: Concatenated UTF-8 names
+        :param order: Rows sorted by case-folded name, built on first use if omitted
+        """
+        self._appids = appids
+        self._offsets = offsets
+        self._names = names
+        self._order = order
+
+    @classmethod
+    def from_apps(cls, apps: Iterable[Tuple[int, str]]) -> "AppTable":
+        """
+        Build a table from (appid, name) pairs.
+
+        :param apps: (appid, name) pairs in any order
+        :type apps: Iterable[Tuple[int, str]]
+        :rtype: AppTable
+        """
+        appids = array("I")
+        offsets = array("I", [0])
+        names = bytearray()
+        for appid, name in apps:
+            appids.append(appid)
+            names += name.encode("utf-8")
+            offsets.append(len(names))
+        if all(appids[i] <= appids[i + 1] for i in range(len(appids) - 1)):
+            return cls(appids, offsets, bytes(names))
+        rows = sorted(range(len(appids)), key=appids.__getitem__)
+        sorted_appids = array("I", (appids[row] for row in rows))
+        sorted_offsets = array("I", [0])
+        sorted_names = bytearray()
+        for row in rows:
+            sorted_names += names[offsets[row]:offsets[row + 1]]
+            sorted_offsets.append(len(sorted_names))
+        return cls(sorted_appids, sorted_offsets, bytes(sorted_names))
+
+    @classmethod
+    def parse(cls, chunks: Iterable[bytes]) -> "AppTable":
+        """
+        Build a table from a GetAppList response body, parsed incrementally.
+
+        :param chunks: Response body in pieces
+        :type chunks: Iterable[bytes]
+        :rtype: AppTable
+        """
+        return cls.from_apps(iter_apps(chunks))
+
+    def save(self, path: str) -> None:
+        """
+        Write the table to a snapshot file that :meth:`load` can map into memory.
+        The file is replaced atomically.
+
+        :param path: Snapshot file
+        :type path: str
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, len(self._appids), len(self._names)))
+            for values in (self._appids, self._offsets, self.order):
+                f.write(memoryview(values).cast("B"))
+            f.write(self._names)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "AppTable":
+        """
+        Map a snapshot written by :meth:`save` into memory.
+        Pages are read from disk only when a lookup touches them.
+
+        :param path: Snapshot file
+        :type path: str
+        :rtype: AppTable
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        magic, count, names_size = _SNAPSHOT_HEADER.unpack_from(view)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("Invalid app snapshot!")
+        position = _SNAPSHOT_HEADER.size
+        arrays = []
+        for size in (count, count + 1, count):
+            arrays.append(view[position:position + size * 4].cast("I"))
+            position += size * 4
+        appids, offsets, order = arrays
+        return cls(appids, offsets, view[position:position + names_size], order)
+
+    def diff(self, other: "AppTable") -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        """
+        Compare with a newer table.
+
+        :param other: Newer table
+        :type other: AppTable
+        :return: Apps only in ``other`` (added or renamed) and apps only in this table (removed or renamed)
+        :rtype: Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]
+        """
+        added, removed = [], []
+        old, new = iter(self), iter(other)
+        old_app, new_app = next(old, None), next(new, None)
+        while old_app is not None or new_app is not None:
+            if new_app is None or (old_app is not None and old_app[0] < new_app[0]):
+                removed.append(old_app)
+                old_app = next(old, None)
+            elif old_app is None or new_app[0] < old_app[0]:
+                added.append(new_app)
+                new_app = next(new, None)
+            else:
+                if old_app[1] != new_app[1]:
+                    removed.append(old_app)
+                    added.append(new_app)
+                old_app, new_app = next(old, None), next(new, None)
+        return added, removed
+
+    def __len__(self) -> int:
+        return len(self._appids)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for row in range(len(self._appids)):
+            yield self._appids[row], self._row_name(row)
+
+    def __contains__(self, appid: int) -> bool:
+        return self._row(appid) is not None
+
+    def _row_name(self, row: int) -> str:
+        return bytes(self._names[self._offsets[row]:self._offsets[row + 1]]).decode("utf-8")
+
+    def _row(self, appid: int) -> Union[int, None]:
+        row = bisect_left(self._appids, appid)
+        if row < len(self._appids) and self._appids[row] == appid:
+            return row
+        return None
+
+    @property
+    def order(self):
+        """Rows sorted by case-folded name."""
+        if self._order is None:
+            self._order = array("I", sorted(range(len(self._appids)),
+                                            key=lambda row: self._row_name(row).casefold()))
+        return self._order
+
+    def _name_bound(self, folded: str) -> int:
+        """Return the first position in :attr:`order` whose name is not below ``folded``."""
+        order = self.order
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._row_name(order[middle]).casefold() < folded:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def name(self, appid: int, default: str = None) -> Union[str, None]:
+        """
+        Return the name of an app.
+
+        :param appid: App ID
+        :type appid: int
+        :param default: Returned for unknown apps
+        :type default: str
+        :rtype: str
+        """
+        row = self._row(appid)
+        return default if row is None else self._row_name(row)
+
+    def appid(self, name: str) -> Union[int, None]:
+        """
+        Return the ID of the app with this name, ignoring case.
+
+        :param name: App name
+        :type name: str
+        :rtype: int
+        """
+        folded = name.casefold()
+        position = self._name_bound(folded)
+        if position < len(self.order):
+            row = self.order[position]
+            if self._row_name(row).casefold() == folded:
+                return self._appids[row]
+        return None
+
+    def search(self, prefix: str, limit: int = 20) -> List[Tuple[int, str]]:
+        """
+        Return the apps whose name starts with a prefix, ignoring case, in name order.
+
+        :param prefix: Name prefix
+        :type prefix: str
+        :param limit: Maximum number of apps returned
+        :type limit: int
+        :return: (appid, name) pairs
+        :rtype: List[Tuple[int, str]]
+        """
+        folded = prefix.casefold()
+        order = self.order
+        found = []
+        position = self._name_bound(folded)
+        while position < len(order) and len(found) < limit:
+            row = order[position]
+            name = self._row_name(row)
+            if not name.casefold().startswith(folded):
+                break
+            found.append((self._appids[row], name))
+            position += 1
+        return found
+
+    def fuzzy(self, query: str, limit: int = 10, cutoff: float = 0.6) -> List[Tuple[int, str]]:
+        """
+        Return the apps with names most similar to a query.
+
+        Candidates are the apps whose name starts with the same character as the query.
+
+        :param query: Approximate app name
+        :type query: str
+        :param limit: Maximum number of apps returned
+        :type limit: int
+        :param cutoff: Minimum similarity between 0 and 1
+        :type cutoff: float
+        :return: (appid, name) pairs, best match first
+        :rtype: List[Tuple[int, str]]
+        """
+        folded = query.casefold()
+        if not folded:
+            return []
+        candidates = {}
+        order = self.order
+        position = self._name_bound(folded[0])
+        while position < len(order):
+            row = order[position]
+            name = self._row_name(row)
+            if not name.casefold().startswith(folded[0]):
+                break
+            candidates.setdefault(name.casefold(), row)
+            position += 1
+        import difflib
+        matches = difflib.get_close_matches(folded, candidates, n=limit, cutoff=cutoff)
+        return [(self._appids[candidates[match]], self._row_name(candidates[match])) for match in matches]
+
+
+class AppCatalogue(object):
+    """
+    Local copy of the Steam app list, kept current in the background.
+
+    The catalogue starts from a memory-mapped snapshot on disk, so startup does not wait
+    for the download. A background thread downloads the app list every ``refresh_interval``
+    seconds, and only when apps were added, removed or renamed is the snapshot rewritten
+    and the in-memory table swapped. A download that would remove more than ``max_removed``
+    of the apps, such as the empty list Steam sometimes returns, is rejected and the current
+    table is kept.
+    """
+
+    def __init__(self,
+                 apps,
+                 path: str,
+                 refresh_interval: float = 86400.0,
+                 on_change: Callable[[List[Tuple[int, str]], List[Tuple[int, str]]], None] = None,
+                 max_removed: float = 0.05) -> None:
+        """
+        :param apps: Interface used to download the app list
+        :type apps: ISteamApps
+        :param path: Snapshot file
+        :type path: str
+        :param refresh_interval: Seconds between downloads
+        :type refresh_interval: float
+        :param on_change: Called with the added and removed apps after every refresh that changed something
+        :type on_change: Callable
+        :param max_removed: Largest fraction of the apps a refresh may remove
+        :type max_removed: float
+        """
+        self._apps = apps
+        self._path = path
+        self._refresh_interval = refresh_interval
+        self._on_change = on_change
+        self._max_removed = max_removed
+        self._table = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def table(self) -> AppTable:
+        """Current app table, loaded on first access. Raises ValueError without a snapshot and a download."""
+        if self._table is None:
+            with self._lock:
+                self._load()
+                if self._table is None:
+                    self._refresh()
+        return self._table
+
+    def _load(self) -> None:
+        """Load the snapshot if no table is loaded yet; the lock must be held."""
+        if self._table is None and os.path.exists(self._path):
+            self._table = AppTable.load(self._path)
+
+    def _refresh(self) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        new_table = self._apps.get_app_list(compact=True)
+        if new_table is None:
+            raise ValueError("Failed to download the app list!")
+        if not len(new_table):
+            raise ValueError("Steam returned an empty app list!")
+        if self._table is None:
+            added, removed = list(new_table), []
+        else:
+            added, removed = self._table.diff(new_table)
+            # Renamed apps are in both lists.
+            gone = {appid for appid, _ in removed} - {appid for appid, _ in added}
+            if len(gone) > self._max_removed * len(self._table):
+                raise ValueError(f"The app list lost {len(gone)} of {len(self._table)} apps, keeping the current one!")
+        if added or removed:
+            new_table.save(self._path)
+            self._table = new_table
+            if self._on_change is not None:
+                self._on_change(added, removed)
+        return added, removed
+
+    def refresh(self) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        """
+        Download the app list now and apply the changes.
+        Raises ValueError if the download failed or was rejected; the current table is kept.
+
+        :return: Added and removed apps; a renamed app is in both
+        :rtype: Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]
+        """
+        with self._lock:
+            self._load()
+            return self._refresh()
+
+    def _run(self) -> None:
+        try:
+            age = time.time() - os.path.getmtime(self._path)
+        except OSError:
+            age = self._refresh_interval
+        delay = max(0.0, self._refresh_interval - age)
+        import logging
+        logger = logging.getLogger(__name__)
+        while not self._stopped.wait(delay):
+            try:
+                self.refresh()
+            except Exception:
+                # A failed refresh keeps the current table; try again next interval.
+                logger.exception("Failed to refresh the app catalogue %s", self._path)
+            delay = self._refresh_interval
+
+    def start(self) -> "AppCatalogue":
+        """
+        Load the catalogue and start refreshing it in the background.
+
+        :rtype: AppCatalogue
+        """
+        self.table
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="AppCatalogue", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background refresh."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def name(self, appid: int, default: str = None) -> Union[str, None]:
+        """Return the name of an app, see :meth:`AppTable.name`."""
+        return self.table.name(appid, default)
+
+    def appid(self, name: str) -> Union[int, None]:
+        """Return the ID of the app with this name, see :meth:`AppTable.appid`."""
+        return self.table.appid(name)
+
+    def search(self, prefix: str, limit: int = 20) -> List[Tuple[int, str]]:
+        """Return the apps whose name starts with a prefix, see :meth:`AppTable.search`."""
+        return self.table.search(prefix, limit)
+
+    def fuzzy(self, query: str, limit: int = 10, cutoff: float = 0.6) -> List[Tuple[int, str]]:
+        """Return the apps with names most similar to a query, see :meth:`AppTable.fuzzy`."""
+        return self.table.fuzzy(query, limit, cutoff)
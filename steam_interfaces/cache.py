@@ -0,0 +1,250 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Dict, Tuple, Union
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# Seconds a response stays fresh, per (interface, method).
+# Methods not listed here are not cached unless the cache has a default ttl.
+DEFAULT_TTLS = {
+    ("ISteamApps", "GetAppList"): 3600,
+    ("ISteamWebAPIUtil", "GetSupportedAPIList"): 3600,
+    ("IDOTA2Match_570", "GetTeamInfoByTeamID"): 3600,
+    ("IPlayerService", "GetBadges"): 600,
+    ("IPlayerService", "GetSteamLevel"): 600,
+    ("IPlayerService", "GetOwnedGames"): 300,
+    ("ISteamNews", "GetNewsForApp"): 300,
+    ("IDOTA2Fantasy_570", "GetPlayerInfo"): 300,
+}
+
+
+def _is_finished_match(response: dict) -> bool:
+    """GetMatchDetails answers unknown or unfinished matches with an error instead of match data."""
+    return "error" not in response.get("result", {})
+
+
+# Methods whose successful responses never change, with a check that a response is
+# a final one worth keeping forever.
+IMMUTABLE_METHODS = {
+    ("IDOTA2Match_570", "GetMatchDetails"): _is_finished_match,
+}
+
+
+def cache_key(host: str, interface: str, method: str, version: int, params: dict) -> tuple:
+    """
+    Build the cache key of a request. The API key is never part of it.
+
+    :param host: Steam API host
+    :type host: str
+    :param interface: Steam API interface
+    :type interface: str
+    :param method: Steam API method
+    :type method: str
+    :param version: Steam API version
+    :type version: int
+    :param params: Steam API parameters
+    :type params: dict
+    :return: Hashable key
+    :rtype: tuple
+    """
+    items = tuple(sorted((name, str(value)) for name, value in params.items()
+                         if name != "key" and value is not None))
+    return host, interface, method, version, items
+
+
+class MemoryCache(object):
+    """
+    Thread-safe in-memory LRU cache of Steam API responses.
+
+    Cached responses are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self,
+                 maxsize: int = 1024,
+                 ttl: Union[float, None] = None,
+                 ttls: Dict[Tuple[str, str], float] = None) -> None:
+        """
+        :param maxsize: Maximum number of cached responses, the least recently used one is evicted first
+        :type maxsize: int
+        :param ttl: Time to live in seconds of methods without a ttl policy, None to not cache them
+        :type ttl: float
+        :param ttls: Per (interface, method) ttl overrides, merged over DEFAULT_TTLS. A ttl of 0 disables caching.
+        :type ttls: Dict[Tuple[str, str], float]
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._ttls = dict(DEFAULT_TTLS)
+        self._ttls.update(ttls or {})
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, interface: str, method: str) -> Union[float, None]:
+        """
+        Return the time to live of a method, None if it is not cached.
+
+        :param interface: Steam API interface
+        :type interface: str
+        :param method: Steam API method
+        :type method: str
+        :return: Time to live in seconds
+        :rtype: float
+        """
+        return self._ttls.get((interface, method), self._ttl) or None
+
+    def get(self, key: tuple):
+        """
+        Return a fresh cached response or None.
+
+        :param key: Cache key
+        :type key: tuple
+        :return: Steam API response
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: tuple, value, ttl: float) -> None:
+        """
+        Store a response.
+
+        :param key: Cache key
+        :type key: tuple
+        :param value: Steam API response
+        :param ttl: Time to live in seconds
+        :type ttl: float
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached response and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(object):
+    """
+    Persistent cache of immutable Steam API responses.
+
+    Responses are stored zlib compressed in a SQLite database in WAL mode, so any number
+    of threads and processes can read it while one of them writes, and the cache
+    survives restarts.
+    """
+
+    def __init__(self,
+                 path: str,
+                 methods: Dict[Tuple[str, str], Callable[[dict], bool]] = None,
+                 compression_level: int = 6,
+                 timeout: float = 30.0) -> None:
+        """
+        :param path: Database file, created if it does not exist
+        :type path: str
+        :param methods: (interface, method) pairs to cache, mapped to a check that a response is final.
+        Defaults to IMMUTABLE_METHODS.
+        :type methods: Dict[Tuple[str, str], Callable[[dict], bool]]
+        :param compression_level: zlib compression level
+        :type compression_level: int
+        :param timeout: Seconds to wait for another process holding the write lock
+        :type timeout: float
+        """
+        self._path = path
+        self._methods = IMMUTABLE_METHODS if methods is None else methods
+        self._compression_level = compression_level
+        self._timeout = timeout
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+
+    @property
+    def _connection(self) -> "sqlite3.Connection":
+        """Connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            import sqlite3
+            connection = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _serialize_key(key: tuple) -> str:
+        return json.dumps(key, separators=(",", ":"))
+
+    def is_cached(self, interface: str, method: str) -> bool:
+        """
+        Return whether responses of a method are stored.
+
+        :param interface: Steam API interface
+        :type interface: str
+        :param method: Steam API method
+        :type method: str
+        :rtype: bool
+        """
+        return (interface, method) in self._methods
+
+    def get(self, key: tuple):
+        """
+        Return a stored response or None.
+
+        :param key: Cache key
+        :type key: tuple
+        :return: Steam API response
+        """
+        row = self._connection.execute("SELECT value FROM responses WHERE key = ?",
+                                       (self._serialize_key(key),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, key: tuple, value: dict) -> None:
+        """
+        Store a response if it is a final one.
+
+        :param key: Cache key
+        :type key: tuple
+        :param value: Steam API response
+        :type value: dict
+        """
+        is_final = self._methods.get((key[1], key[2]))
+        if is_final is None or not is_final(value):
+            return
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), self._compression_level)
+        self._connection.execute("INSERT OR IGNORE INTO responses (key, value) VALUES (?, ?)",
+                                 (self._serialize_key(key), blob))
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
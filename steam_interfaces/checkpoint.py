@@ -0,0 +1,51 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import json
+import os
+import threading
+
+
+class FileCheckpoint(object):
+    """
+    Position of a feed, stored as JSON in a file.
+
+    The file is replaced atomically, so a crash never leaves a half written checkpoint.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Checkpoint file, created on first save
+        :type path: str
+        """
+        self._path = path
+        self._lock = threading.Lock()
+
+    def load(self, default=None):
+        """
+        Return the saved position.
+
+        :param default: Value returned when nothing was saved yet
+        :return: Saved position
+        """
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    def save(self, value) -> None:
+        """
+        Save a position.
+
+        :param value: JSON serializable position
+        """
+        tmp_path = f"{self._path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path)
@@ -0,0 +1,99 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import threading
+from typing import TYPE_CHECKING, Awaitable, Callable, Hashable
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class RequestGroup(object):
+    """
+    Shares one call among identical calls that overlap in time.
+
+    The first caller of a key runs the call; callers arriving while it is in flight wait
+    for it and receive the same result, or the same exception. Nothing is kept once the
+    call finishes, so later callers run it again. Threads and asyncio tasks of any event
+    loop can use the same group.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    @classmethod
+    def default(cls) -> "RequestGroup":
+        """
+        Return the process-wide group used by interfaces created with ``coalesce=True``.
+
+        :return: Shared group
+        :rtype: RequestGroup
+        """
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    def do(self, key: Hashable, call: Callable[[], object]):
+        """
+        Run ``call`` unless a call with the same key is in flight, then wait for that one.
+
+        :param key: Identifies identical calls
+        :type key: Hashable
+        :param call: Makes the call
+        :type call: Callable[[], object]
+        :return: Result of the call
+        """
+        from concurrent.futures import Future
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            result = call()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(self, key: Hashable, call: Callable[[], Awaitable]):
+        """
+        Async version of :meth:`do`, ``call`` is a coroutine function.
+
+        The call runs in its own task, so a cancelled waiter does not cancel it for the others.
+        """
+        import asyncio
+        loop = asyncio.get_event_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = asyncio.ensure_future(call())
+                task.add_done_callback(lambda done: self._forget(task_key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, task_key: tuple, task: "asyncio.Future") -> None:
+        with self._lock:
+            del self._tasks[task_key]
+        if not task.cancelled():
+            # Retrieve the exception so that it is not reported when every waiter was cancelled.
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls) + len(self._tasks)
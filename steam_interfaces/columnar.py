@@ -0,0 +1,149 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import os
+from typing import Dict, Iterable, List
+
+import numpy
+
+# Match fields repeated on every row of the match, with their column type.
+MATCH_COLUMNS = (
+    ("match_id", "u8"), ("match_seq_num", "u8"), ("start_time", "u4"), ("duration", "u4"),
+    ("radiant_win", "u1"), ("game_mode", "u1"), ("lobby_type", "u1"), ("leagueid", "u4"),
+    ("cluster", "u2"), ("radiant_score", "u2"), ("dire_score", "u2"),
+)
+
+# Fields of each player, with their column type. Anonymous players keep the account ID 4294967295.
+PLAYER_COLUMNS = (
+    ("account_id", "u4"), ("player_slot", "u1"), ("team_number", "u1"), ("hero_id", "u2"),
+    ("item_0", "u2"), ("item_1", "u2"), ("item_2", "u2"), ("item_3", "u2"), ("item_4", "u2"), ("item_5", "u2"),
+    ("backpack_0", "u2"), ("backpack_1", "u2"), ("backpack_2", "u2"), ("item_neutral", "u2"),
+    ("kills", "u2"), ("deaths", "u2"), ("assists", "u2"), ("leaver_status", "u1"),
+    ("last_hits", "u2"), ("denies", "u2"), ("gold_per_min", "u2"), ("xp_per_min", "u2"), ("level", "u1"),
+    ("net_worth", "u4"), ("gold", "u4"), ("gold_spent", "u4"),
+    ("hero_damage", "u4"), ("tower_damage", "u4"), ("hero_healing", "u4"),
+)
+
+_DTYPE = numpy.dtype(list(MATCH_COLUMNS + PLAYER_COLUMNS))
+_MATCH_NAMES = [name for name, _ in MATCH_COLUMNS]
+_PLAYER_NAMES = [name for name, _ in PLAYER_COLUMNS]
+
+
+def _match_result(match) -> dict:
+    """Accept a GetMatchDetails response, its result or a :class:`steam_interfaces.models.Match`."""
+    if isinstance(match, dict) and "result" in match:
+        return match["result"]
+    return match
+
+
+def _rows(matches: Iterable) -> Iterable[tuple]:
+    for match in matches:
+        match = _match_result(match)
+        if match is None or match.get("players") is None:
+            continue
+        head = tuple(int(match.get(name) or 0) for name in _MATCH_NAMES)
+        for player in match["players"]:
+            yield head + tuple(int(player.get(name) or 0) for name in _PLAYER_NAMES)
+
+
+class MatchColumns(object):
+    """
+    Match details packed into fixed-width NumPy columns, one row per match and player.
+
+    Match fields are repeated on the rows of each of its players, so aggregates such as
+    the win rate per hero are plain vectorized expressions over the columns.
+    """
+
+    columns = tuple(_DTYPE.names)
+
+    def __init__(self, arrays: Dict[str, numpy.ndarray]) -> None:
+        """
+        :param arrays: One array per column name, all of the same length
+        :type arrays: Dict[str, numpy.ndarray]
+        """
+        self._arrays = arrays
+
+    @classmethod
+    def from_matches(cls, matches: Iterable, chunk_size: int = 65536) -> "MatchColumns":
+        """
+        Pack match details.
+
+        :param matches: GetMatchDetails responses, their results or typed matches
+        :type matches: Iterable
+        :param chunk_size: Rows converted at a time, bounding the memory of the intermediate rows
+        :type chunk_size: int
+        :return: Columns
+        :rtype: MatchColumns
+        """
+        chunks = []
+        rows = []
+        for row in _rows(matches):
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                chunks.append(numpy.array(rows, dtype=_DTYPE))
+                rows = []
+        if rows or not chunks:
+            chunks.append(numpy.array(rows, dtype=_DTYPE))
+        table = numpy.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+        return cls({name: numpy.ascontiguousarray(table[name]) for name in cls.columns})
+
+    @classmethod
+    def concatenate(cls, parts: List["MatchColumns"]) -> "MatchColumns":
+        """
+        Join several batches into one.
+
+        :param parts: Batches to join, in order
+        :type parts: List[MatchColumns]
+        :rtype: MatchColumns
+        """
+        return cls({name: numpy.concatenate([part[name] for part in parts]) for name in cls.columns})
+
+    def save(self, directory: str) -> None:
+        """
+        Save every column to ``<directory>/<column>.npy``.
+
+        :param directory: Output directory, created if it does not exist
+        :type directory: str
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in self.columns:
+            numpy.save(os.path.join(directory, f"{name}.npy"), self._arrays[name])
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "MatchColumns":
+        """
+        Load columns saved by :meth:`save`.
+
+        :param directory: Directory the columns were saved to
+        :type directory: str
+        :param mmap: Map the files read-only instead of reading them, so only the columns
+        and rows actually used are paged in
+        :type mmap: bool
+        :rtype: MatchColumns
+        """
+        mode = "r" if mmap else None
+        return cls({name: numpy.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+                    for name in cls.columns})
+
+    def __getitem__(self, name: str) -> numpy.ndarray:
+        return self._arrays[name]
+
+    def __len__(self) -> int:
+        return len(self._arrays["match_id"])
+
+    @property
+    def radiant(self) -> numpy.ndarray:
+        """Boolean mask of the rows of Radiant players."""
+        return self._arrays["player_slot"] < 128
+
+    @property
+    def won(self) -> numpy.ndarray:
+        """Boolean mask of the rows of players on the winning team."""
+        return self.radiant == self._arrays["radiant_win"].astype(bool)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the columns in bytes."""
+        return sum(array.nbytes for array in self._arrays.values())
@@ -0,0 +1,305 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Iterator, List, Tuple, Union
+
+from .checkpoint import FileCheckpoint
+
+
+class _SequencePager(object):
+    """
+    Plans the pages of GetMatchHistoryBySequenceNum ahead of the consumer.
+
+    Sequence numbers are unique, so a full page of ``size`` matches starting at ``start``
+    always reaches ``start + size - 1``. Speculative pages can therefore be requested
+    before the previous page arrives. The step between them follows the span of the last
+    full page, since sequence numbers have gaps; overlaps are filtered out, and a page
+    that would leave a hole is discarded and requested again.
+    """
+
+    def __init__(self, start: int, size: int) -> None:
+        self.expected = start
+        self.size = size
+        self.step = size
+        self._last = start - size
+
+    def schedule(self) -> int:
+        """Return the start of the next page to request."""
+        self._last = max(self._last + self.step, self.expected)
+        return self._last
+
+    def reset(self) -> None:
+        """Forget the scheduled pages; the next one starts at the expected sequence number."""
+        self._last = self.expected - self.step
+
+    def accept(self, start: int, response: Union[dict, None]) -> Union[Tuple[List[dict], bool], None]:
+        """
+        Take a page in.
+
+        :return: New matches and whether the page reached the live tip of the stream,
+        None if the page starts past the expected sequence number and must be discarded
+        :rtype: Tuple[List[dict], bool]
+        """
+        if start > self.expected:
+            return None
+        result = (response or {}).get("result", {})
+        if result.get("status", 1) != 1:
+            return [], True
+        matches = result.get("matches", [])
+        new = [match for match in matches if match["match_seq_num"] >= self.expected]
+        if new:
+            self.expected = new[-1]["match_seq_num"] + 1
+        if len(matches) < self.size:
+            return new, True
+        # Stay a little short of the observed span so the next page rarely starts past the expected number.
+        self.step = max(self.size, int((matches[-1]["match_seq_num"] - start + 1) * 0.9))
+        return new, False
+
+
+def _sequence_start(start: Union[int, None], checkpoint: Union[FileCheckpoint, None]) -> int:
+    """Return the saved sequence number, or ``start`` when the checkpoint is empty."""
+    if checkpoint is not None:
+        start = checkpoint.load(start)
+    if start is None:
+        raise ValueError("The checkpoint is empty, start_at_match_seq_num is required on the first run!")
+    return start
+
+
+def iter_match_sequence(fetch: Callable[[int], dict],
+                        start: int,
+                        matches_requested: int = 100,
+                        prefetch: int = 4,
+                        checkpoint: FileCheckpoint = None,
+                        poll_interval: float = 5.0,
+                        max_poll_interval: float = 60.0,
+                        stop_at_tip: bool = False) -> Iterator[dict]:
+    """
+    Yield matches in sequence order, keeping ``prefetch`` pages in flight.
+
+    :param fetch: Returns the page starting at a sequence number
+    :type fetch: Callable[[int], dict]
+    :param start: Sequence number to start at when the checkpoint is empty, required if it is
+    :type start: int
+    :param matches_requested: Matches per page
+    :type matches_requested: int
+    :param prefetch: Pages requested ahead of the consumer
+    :type prefetch: int
+    :param checkpoint: Where the next sequence number is saved after every page
+    :type checkpoint: FileCheckpoint
+    :param poll_interval: First wait in seconds at the live tip, doubled while no new matches arrive
+    :type poll_interval: float
+    :param max_poll_interval: Longest wait in seconds at the live tip
+    :type max_poll_interval: float
+    :param stop_at_tip: Return at the live tip instead of waiting for new matches
+    :type stop_at_tip: bool
+    :return: Matches
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    pager = _SequencePager(_sequence_start(start, checkpoint), matches_requested)
+    delay = poll_interval
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    try:
+        while True:
+            while len(pending) < prefetch:
+                page_start = pager.schedule()
+                pending.append((page_start, executor.submit(fetch, page_start)))
+            page_start, future = pending.popleft()
+            page = pager.accept(page_start, future.result())
+            if page is None:
+                for _, stale in pending:
+                    stale.cancel()
+                pending.clear()
+                pager.reset()
+                continue
+            matches, at_tip = page
+            for match in matches:
+                yield match
+            if checkpoint is not None and matches:
+                checkpoint.save(pager.expected)
+            if not at_tip:
+                delay = poll_interval
+                continue
+            for _, stale in pending:
+                stale.cancel()
+            pending.clear()
+            pager.reset()
+            if stop_at_tip:
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_match_sequence(fetch: Callable,
+                               start: int,
+                               matches_requested: int = 100,
+                               prefetch: int = 4,
+                               checkpoint: FileCheckpoint = None,
+                               poll_interval: float = 5.0,
+                               max_poll_interval: float = 60.0,
+                               stop_at_tip: bool = False) -> AsyncIterator[dict]:
+    """Async version of :func:`iter_match_sequence`, ``fetch`` is a coroutine function."""
+    import asyncio
+    pager = _SequencePager(_sequence_start(start, checkpoint), matches_requested)
+    delay = poll_interval
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < prefetch:
+                page_start = pager.schedule()
+                pending.append((page_start, asyncio.ensure_future(fetch(page_start))))
+            page_start, task = pending.popleft()
+            page = pager.accept(page_start, await task)
+            if page is None:
+                for _, stale in pending:
+                    stale.cancel()
+                pending.clear()
+                pager.reset()
+                continue
+            matches, at_tip = page
+            for match in matches:
+                yield match
+            if checkpoint is not None and matches:
+                checkpoint.save(pager.expected)
+            if not at_tip:
+                delay = poll_interval
+                continue
+            for _, stale in pending:
+                stale.cancel()
+            pending.clear()
+            pager.reset()
+            if stop_at_tip:
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+def _history_page(response: Union[dict, None]) -> Tuple[List[dict], Union[int, None]]:
+    """
+    Split a GetMatchHistory page into its matches and the cursor of the next page.
+
+    :return: Matches and the next start_at_match_id, None after the last page
+    :rtype: Tuple[List[dict], int]
+    """
+    result = (response or {}).get("result", {})
+    matches = result.get("matches", [])
+    if result.get("status", 1) != 1 or not matches or result.get("results_remaining", 1) <= 0:
+        return matches, None
+    return matches, matches[-1]["match_id"] - 1
+
+
+def iter_match_history(fetch: Callable[[Union[int, None]], dict],
+                       start_at_match_id: int = None,
+                       stop: Callable[[dict], bool] = None) -> Iterator[dict]:
+    """
+    Yield matches from newest to oldest across all pages of GetMatchHistory.
+    The next page is fetched while the current one is consumed.
+
+    :param fetch: Returns the page starting at a match ID, None for the newest match
+    :type fetch: Callable[[int], dict]
+    :param start_at_match_id: Match ID to start at
+    :type start_at_match_id: int
+    :param stop: Called with every match, iteration ends at the first match it returns True for
+    :type stop: Callable[[dict], bool]
+    :return: Matches
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, start_at_match_id)
+        while future is not None:
+            matches, cursor = _history_page(future.result())
+            future = executor.submit(fetch, cursor) if cursor is not None else None
+            for match in matches:
+                if stop is not None and stop(match):
+                    if future is not None:
+                        future.cancel()
+                    return
+                yield match
+
+
+async def aiter_match_history(fetch: Callable,
+                              start_at_match_id: int = None,
+                              stop: Callable[[dict], bool] = None) -> AsyncIterator[dict]:
+    """Async version of :func:`iter_match_history`, ``fetch`` is a coroutine function."""
+    import asyncio
+    task = asyncio.ensure_future(fetch(start_at_match_id))
+    try:
+        while task is not None:
+            matches, cursor = _history_page(await task)
+            task = asyncio.ensure_future(fetch(cursor)) if cursor is not None else None
+            for match in matches:
+                if stop is not None and stop(match):
+                    return
+                yield match
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def _deleted_page(response: Union[dict, None], rowversion: int) -> Tuple[List[str], Union[int, None]]:
+    """
+    Split a GetDeletedSteamIDs page into its SteamIDs and the next row version.
+
+    :return: SteamIDs and the row version of the next page, None once the feed is exhausted
+    :rtype: Tuple[List[str], int]
+    """
+    result = (response or {}).get("response", {})
+    steamids = [deleted["steamid"] for deleted in result.get("deletedids", [])]
+    next_rowversion = int(result.get("rowversion", rowversion))
+    if not steamids or next_rowversion == rowversion:
+        return steamids, None
+    return steamids, next_rowversion
+
+
+def iter_deleted_steam_ids(fetch: Callable[[int], dict],
+                           rowversion: int = 0,
+                           checkpoint: FileCheckpoint = None) -> Iterator[List[str]]:
+    """
+    Yield batches of deleted SteamIDs until the row version cursor is exhausted.
+
+    The checkpoint is saved when the consumer asks for the next batch, so a batch
+    interrupted while being processed is delivered again on the next run.
+
+    :param fetch: Returns the page at a row version
+    :type fetch: Callable[[int], dict]
+    :param rowversion: Row version to start at when the checkpoint is empty
+    :type rowversion: int
+    :param checkpoint: Where the row version of the next page is saved
+    :type checkpoint: FileCheckpoint
+    :return: Lists of SteamIDs
+    """
+    if checkpoint is not None:
+        rowversion = checkpoint.load(rowversion)
+    while rowversion is not None:
+        steamids, next_rowversion = _deleted_page(fetch(rowversion), rowversion)
+        if steamids:
+            yield steamids
+        if checkpoint is not None and next_rowversion is not None:
+            checkpoint.save(next_rowversion)
+        rowversion = next_rowversion
+
+
+async def aiter_deleted_steam_ids(fetch: Callable,
+                                  rowversion: int = 0,
+                                  checkpoint: FileCheckpoint = None) -> AsyncIterator[List[str]]:
+    """Async version of :func:`iter_deleted_steam_ids`, ``fetch`` is a coroutine function."""
+    if checkpoint is not None:
+        rowversion = checkpoint.load(rowversion)
+    while rowversion is not None:
+        steamids, next_rowversion = _deleted_page(await fetch(rowversion), rowversion)
+        if steamids:
+            yield steamids
+        if checkpoint is not None and next_rowversion is not None:
+            checkpoint.save(next_rowversion)
+        rowversion = next_rowversion
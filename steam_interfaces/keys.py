@@ -0,0 +1,168 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import threading
+import time
+from typing import Dict, List, Union
+
+from .ratelimit import TokenBucket
+
+
+class KeyPoolExhausted(Exception):
+    """Raised when every key of a KeyPool is out of rotation or out of quota."""
+
+
+class _KeyState(object):
+    __slots__ = ("key", "in_flight", "requests", "failures", "day", "used_today", "benched_until")
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.day = None
+        self.used_today = 0
+        self.benched_until = 0.0
+
+
+class KeyPool(object):
+    """
+    Pool of Steam API keys that interfaces accept in place of a single key.
+
+    Every request goes out with the least loaded key that is in rotation. Keys answering
+    403 are taken out of rotation for ``cooldown`` seconds, keys answering 429 for as long
+    as its ``Retry-After`` header asks, or ``cooldown`` seconds without one. Keys that used
+    up their daily quota wait for the next UTC day.
+    """
+
+    # Status codes that take a key out of rotation.
+    bench_statuses = (403, 429)
+
+    def __init__(self,
+                 keys: List[str],
+                 rate_limit: float = None,
+                 daily_quota: Union[int, None] = 100000,
+                 cooldown: float = 60.0) -> None:
+        """
+        :param keys: Steam API keys
+        :type keys: List[str]
+        :param rate_limit: Requests per second allowed for each key
+        :type rate_limit: float
+        :param daily_quota: Requests per key and UTC day, None for no quota
+        :type daily_quota: int
+        :param cooldown: Seconds a rejected key stays out of rotation
+        :type cooldown: float
+        """
+        if not keys:
+            raise ValueError("Key pool is empty!")
+        self._states = [_KeyState(key) for key in keys]
+        self._by_key = {state.key: state for state in self._states}
+        self._rate_limit = rate_limit
+        self._daily_quota = daily_quota
+        self._cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _is_available(self, state: _KeyState, now: float, day: int) -> bool:
+        if state.benched_until > now:
+            return False
+        return self._daily_quota is None or state.day != day or state.used_today < self._daily_quota
+
+    def acquire(self, benched: bool = False) -> str:
+        """
+        Pick the least loaded key in rotation and count a request against it.
+
+        :param benched: When every key is out of rotation, pick the one whose cooldown ends first
+        instead of raising. Keys that used up their daily quota are never picked.
+        :type benched: bool
+        :return: Steam API key
+        :rtype: str
+        """
+        with self._lock:
+            now = time.monotonic()
+            day = int(time.time() // 86400)
+            available = [state for state in self._states if self._is_available(state, now, day)]
+            if available:
+                state = min(available, key=lambda item: (item.in_flight, item.used_today if item.day == day else 0))
+            else:
+                in_quota = [state for state in self._states if self._is_available(state, state.benched_until, day)]
+                if not benched or not in_quota:
+                    raise KeyPoolExhausted("No API key available!")
+                state = min(in_quota, key=lambda item: item.benched_until)
+            if state.day != day:
+                state.day = day
+                state.used_today = 0
+            state.in_flight += 1
+            state.requests += 1
+            state.used_today += 1
+            return state.key
+
+    def available_in(self) -> Union[float, None]:
+        """
+        Return the seconds until a key is back in rotation.
+
+        :return: 0 if a key is available, None if every key waits for the next UTC day
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            day = int(time.time() // 86400)
+            waits = [max(state.benched_until - now, 0.0) for state in self._states
+                     if self._daily_quota is None or state.day != day or state.used_today < self._daily_quota]
+            return min(waits) if waits else None
+
+    def release(self, key: str, status_code: Union[int, None], retry_after: float = None) -> None:
+        """
+        Return a key after its request finished.
+
+        :param key: Key returned by :meth:`acquire`
+        :type key: str
+        :param status_code: HTTP status of the response, None if the request failed
+        :type status_code: int
+        :param retry_after: Seconds the ``Retry-After`` header of the response asks to wait
+        :type retry_after: float
+        """
+        with self._lock:
+            state = self._by_key[key]
+            state.in_flight -= 1
+            if status_code in self.bench_statuses:
+                state.failures += 1
+                cooldown = retry_after if status_code == 429 and retry_after is not None else self._cooldown
+                state.benched_until = time.monotonic() + cooldown
+
+    def rate_limiter(self, key: str) -> Union[TokenBucket, None]:
+        """
+        Return the rate limiter of a key, None if the pool has no rate limit.
+
+        :param key: Steam API key
+        :type key: str
+        :rtype: TokenBucket
+        """
+        if self._rate_limit is None:
+            return None
+        return TokenBucket.for_key(key, self._rate_limit)
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Return the usage of every key.
+
+        :return: In-flight requests, total requests, rejections, requests today and availability per key
+        :rtype: Dict[str, dict]
+        """
+        with self._lock:
+            now = time.monotonic()
+            day = int(time.time() // 86400)
+            return {
+                state.key: {
+                    "in_flight": state.in_flight,
+                    "requests": state.requests,
+                    "failures": state.failures,
+                    "used_today": state.used_today if state.day == day else 0,
+                    "available": self._is_available(state, now, day)
+                }
+                for state in self._states
+            }
@@ -0,0 +1,311 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, List, Union
+
+if TYPE_CHECKING:
+    import asyncio
+    import concurrent.futures
+
+
+class BatchLoader(object):
+    """
+    Collects single-key lookups into batches.
+
+    The first key of a batch opens a window of ``window`` seconds; every key requested
+    meanwhile joins the batch, which is loaded with one call when the window closes or
+    it reaches ``max_batch`` keys. A key requested twice in one batch is loaded once.
+
+    One background thread closes the windows and a thread pool loads the batches, so
+    create one loader, share it and :meth:`close` it when done.
+    """
+
+    def __init__(self,
+                 load_batch: Callable[[List[Hashable]], Dict[Hashable, object]],
+                 window: float = 0.005,
+                 max_batch: int = 100,
+                 concurrency: int = 4) -> None:
+        """
+        :param load_batch: Returns the values of a list of keys, keyed by key. Missing keys resolve to None.
+        :type load_batch: Callable[[List[Hashable]], Dict[Hashable, object]]
+        :param window: Seconds to wait for more keys after the first one of a batch
+        :type window: float
+        :param max_batch: Largest batch
+        :type max_batch: int
+        :param concurrency: Number of batches loaded in parallel
+        :type concurrency: int
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        self._load_batch = load_batch
+        self._window = window
+        self._max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="BatchLoader")
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._deadline = None
+        self._flusher = None
+        self._closed = False
+
+    def load(self, key: Hashable) -> "concurrent.futures.Future":
+        """
+        Request the value of a key.
+
+        :param key: Key to load
+        :type key: Hashable
+        :return: Future resolved with the value
+        :rtype: Future
+        """
+        from concurrent.futures import Future
+        batch = None
+        with self._condition:
+            if self._closed:
+                raise ValueError("The loader is closed!")
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._pending[key] = Future()
+            if len(self._pending) >= self._max_batch:
+                batch = self._take()
+            elif len(self._pending) == 1:
+                self._deadline = time.monotonic() + self._window
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_windows, name="BatchLoader", daemon=True)
+                    self._flusher.start()
+                self._condition.notify()
+        if batch is not None:
+            self._executor.submit(self._run, batch)
+        return future
+
+    def _take(self) -> dict:
+        """Detach the pending batch; the lock must be held."""
+        batch, self._pending = self._pending, {}
+        self._deadline = None
+        return batch
+
+    def _flush_windows(self) -> None:
+        with self._condition:
+            while not self._closed:
+                if self._deadline is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                self._executor.submit(self._run, self._take())
+
+    def _run(self, batch: dict) -> None:
+        try:
+            values = self._load_batch(list(batch))
+        except Exception as error:
+            for future in batch.values():
+                future.set_exception(error)
+            return
+        for key, future in batch.items():
+            future.set_result(values.get(key))
+
+    def close(self) -> None:
+        """Load the pending batch, wait for the batches being loaded and stop the threads."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            batch = self._take()
+            self._condition.notify()
+        if self._flusher is not None:
+            self._flusher.join()
+        if batch:
+            self._executor.submit(self._run, batch)
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchLoader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncBatchLoader(object):
+    """Async version of :class:`BatchLoader`, ``load_batch`` is a coroutine function."""
+
+    def __init__(self,
+                 load_batch: Callable,
+                 window: float = 0.005,
+                 max_batch: int = 100) -> None:
+        self._load_batch = load_batch
+        self._window = window
+        self._max_batch = max_batch
+        self._pending = {}
+        self._handle = None
+        self._tasks = set()
+        self._closed = False
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        """
+        Request the value of a key.
+
+        :param key: Key to load
+        :type key: Hashable
+        :return: Future resolved with the value
+        :rtype: asyncio.Future
+        """
+        import asyncio
+        if self._closed:
+            raise ValueError("The loader is closed!")
+        future = self._pending.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_event_loop()
+        future = self._pending[key] = loop.create_future()
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._handle is None:
+            self._handle = loop.call_later(self._window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        import asyncio
+        batch, self._pending = self._pending, {}
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict) -> None:
+        try:
+            values = await self._load_batch(list(batch))
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
+
+    async def close(self) -> None:
+        """Load the pending batch and wait for the batches being loaded."""
+        import asyncio
+        self._closed = True
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def _index_players(response: Union[dict, None], field: str) -> Dict[str, dict]:
+    """Key the players of a GetPlayerSummaries or GetPlayerBans response by Steam ID."""
+    response = response or {}
+    players = response.get("response", response).get("players", [])
+    return {player[field]: player for player in players}
+
+
+class PlayerLoader(object):
+    """
+    Batches single-player GetPlayerSummaries and GetPlayerBans lookups made by independent callers.
+
+    Concurrent lookups are combined into requests of up to 100 Steam IDs, and every caller
+    receives its own player. Each loader runs its own threads: create one, share it and
+    :meth:`close` it, or use it as a context manager.
+    """
+
+    def __init__(self, user, window: float = 0.005, max_batch: int = 100) -> None:
+        """
+        :param user: Interface the batches are requested through
+        :type user: ISteamUser
+        :param window: Seconds a batch waits for more Steam IDs
+        :type window: float
+        :param max_batch: Largest batch, at most the endpoint limit of 100
+        :type max_batch: int
+        """
+        self._user = user
+        self._summaries = BatchLoader(self._load_summaries, window, max_batch, user._concurrency)
+        self._bans = BatchLoader(self._load_bans, window, max_batch, user._concurrency)
+
+    def _load_summaries(self, steam_ids: List[str]) -> Dict[str, dict]:
+        return _index_players(self._user.get_player_summaries(steam_ids), "steamid")
+
+    def _load_bans(self, steam_ids: List[str]) -> Dict[str, dict]:
+        return _index_players(self._user.get_player_bans(steam_ids), "SteamId")
+
+    def summary(self, steam_id: int, timeout: float = None) -> Union[dict, None]:
+        """
+        Get the summary of one player.
+
+        :param steam_id: Steam ID
+        :type steam_id: int
+        :param timeout: Seconds to wait for the batch
+        :type timeout: float
+        :return: Player summary, None if Steam returned none
+        :rtype: dict
+        """
+        return self._summaries.load(str(steam_id)).result(timeout)
+
+    def bans(self, steam_id: int, timeout: float = None) -> Union[dict, None]:
+        """
+        Get the bans of one player.
+
+        :param steam_id: Steam ID
+        :type steam_id: int
+        :param timeout: Seconds to wait for the batch
+        :type timeout: float
+        :return: Player bans, None if Steam returned none
+        :rtype: dict
+        """
+        return self._bans.load(str(steam_id)).result(timeout)
+
+    def close(self) -> None:
+        """Load the pending lookups and stop the threads of the loader."""
+        self._summaries.close()
+        self._bans.close()
+
+    def __enter__(self) -> "PlayerLoader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class AsyncPlayerLoader(PlayerLoader):
+    """Async version of :class:`PlayerLoader`, its lookups are coroutines."""
+
+    def __init__(self, user, window: float = 0.005, max_batch: int = 100) -> None:
+        self._user = user
+        self._summaries = AsyncBatchLoader(self._load_summaries, window, max_batch)
+        self._bans = AsyncBatchLoader(self._load_bans, window, max_batch)
+
+    async def _load_summaries(self, steam_ids: List[str]) -> Dict[str, dict]:
+        return _index_players(await self._user.get_player_summaries(steam_ids), "steamid")
+
+    async def _load_bans(self, steam_ids: List[str]) -> Dict[str, dict]:
+        return _index_players(await self._user.get_player_bans(steam_ids), "SteamId")
+
+    async def summary(self, steam_id: int) -> Union[dict, None]:
+        """Get the summary of one player, see :meth:`PlayerLoader.summary`."""
+        import asyncio
+        return await asyncio.shield(self._summaries.load(str(steam_id)))
+
+    async def bans(self, steam_id: int) -> Union[dict, None]:
+        """Get the bans of one player, see :meth:`PlayerLoader.bans`."""
+        import asyncio
+        return await asyncio.shield(self._bans.load(str(steam_id)))
+
+    async def close(self) -> None:
+        """Load the pending lookups, see :meth:`PlayerLoader.close`."""
+        await self._summaries.close()
+        await self._bans.close()
+
+    def __enter__(self) -> "AsyncPlayerLoader":
+        raise TypeError("Use async with with an AsyncPlayerLoader!")
+
+    async def __aenter__(self) -> "AsyncPlayerLoader":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
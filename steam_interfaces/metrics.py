@@ -0,0 +1,240 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple, Union
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket is unbounded.
+DEFAULT_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.035, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3,
+                   0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class CallRecord(object):
+    """
+    Outcome of one Steam API call, passed to the metrics callback of an interface when the call ends.
+
+    ``status`` is None when no HTTP response was received: the call was answered by a cache,
+    shared the request of an identical call in flight (``coalesced``) or failed with ``error``.
+    """
+
+    __slots__ = ("interface", "method", "http_method", "started", "seconds", "status", "bytes",
+                 "retries", "cache_hit", "coalesced", "error")
+
+    def __init__(self, interface: str, method: str, http_method: str) -> None:
+        self.interface = interface
+        self.method = method
+        self.http_method = http_method
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.status = None
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hit = False
+        self.coalesced = False
+        self.error = None
+
+    def __repr__(self) -> str:
+        return (f"CallRecord({self.interface}.{self.method}, status={self.status}, "
+                f"seconds={self.seconds:.6f}, error={self.error})")
+
+
+class _MethodStats(object):
+    __slots__ = ("calls", "statuses", "errors", "bytes", "retries", "cache_hits", "coalesced",
+                 "buckets", "seconds", "max")
+
+    def __init__(self, size: int) -> None:
+        self.calls = 0
+        self.statuses = {}
+        self.errors = {}
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.buckets = [0] * size
+        self.seconds = 0.0
+        self.max = 0.0
+
+
+def _quantile(bounds: Sequence[float], buckets: List[int], maximum: float, q: float) -> Union[float, None]:
+    """Estimate a percentile by linear interpolation inside its bucket, like Prometheus' histogram_quantile."""
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q / 100 * total
+    cumulative = 0
+    for i, count in enumerate(buckets):
+        if count and cumulative + count >= rank:
+            if i == len(bounds):
+                return maximum
+            lower = bounds[i - 1] if i else 0.0
+            return min(lower + (bounds[i] - lower) * (rank - cumulative) / count, maximum)
+        cumulative += count
+    return maximum
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Metrics(object):
+    """
+    Aggregates the calls of any number of interfaces, by interface and method:
+    call counts, HTTP status codes, errors, bytes received, retries, cache hits,
+    coalesced calls and a latency histogram that answers percentile queries.
+
+    Pass it as the ``metrics`` option of the interfaces. Recording a call takes a few
+    microseconds, so it can stay enabled in production.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        :param buckets: Ascending upper bounds in seconds of the latency histogram buckets
+        :type buckets: Sequence[float]
+        """
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("Buckets must be ascending!")
+        self._bounds = tuple(float(bound) for bound in buckets)
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    @classmethod
+    def default(cls) -> "Metrics":
+        """
+        Return the process-wide metrics used by interfaces created with ``metrics=True``.
+
+        :return: Shared metrics
+        :rtype: Metrics
+        """
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    def __call__(self, call: CallRecord) -> None:
+        """
+        Record a finished call.
+
+        :param call: Finished call
+        :type call: CallRecord
+        """
+        bucket = bisect_left(self._bounds, call.seconds)
+        with self._lock:
+            stats = self._methods.get((call.interface, call.method))
+            if stats is None:
+                stats = self._methods[call.interface, call.method] = _MethodStats(len(self._bounds) + 1)
+            stats.calls += 1
+            stats.buckets[bucket] += 1
+            stats.seconds += call.seconds
+            if call.seconds > stats.max:
+                stats.max = call.seconds
+            if call.status is not None:
+                stats.statuses[call.status] = stats.statuses.get(call.status, 0) + 1
+            if call.error is not None:
+                stats.errors[call.error] = stats.errors.get(call.error, 0) + 1
+            stats.bytes += call.bytes
+            stats.retries += call.retries
+            stats.cache_hits += call.cache_hit
+            stats.coalesced += call.coalesced
+
+    def percentile(self, q: float, interface: str = None, method: str = None) -> Union[float, None]:
+        """
+        Estimate a latency percentile from the histogram.
+
+        :param q: Percentile, between 0 and 100
+        :type q: float
+        :param interface: Only count the calls of this interface
+        :type interface: str
+        :param method: Only count the calls of this method
+        :type method: str
+        :return: Latency in seconds, None if no call was recorded
+        :rtype: float
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("Percentile must be between 0 and 100!")
+        buckets = [0] * (len(self._bounds) + 1)
+        maximum = 0.0
+        with self._lock:
+            for (name, method_name), stats in self._methods.items():
+                if (interface is None or name == interface) and (method is None or method_name == method):
+                    buckets = [a + b for a, b in zip(buckets, stats.buckets)]
+                    maximum = max(maximum, stats.max)
+        return _quantile(self._bounds, buckets, maximum, q)
+
+    def snapshot(self) -> Dict[Tuple[str, str], dict]:
+        """
+        Return the current values.
+
+        :return: Counters, total and maximum latency in seconds and the 50th, 90th and 99th
+        latency percentiles, by (interface, method)
+        :rtype: Dict[Tuple[str, str], dict]
+        """
+        with self._lock:
+            return {key: {
+                "calls": stats.calls, "statuses": dict(stats.statuses), "errors": dict(stats.errors),
+                "bytes": stats.bytes, "retries": stats.retries, "cache_hits": stats.cache_hits,
+                "coalesced": stats.coalesced, "seconds": stats.seconds, "max": stats.max,
+                "p50": _quantile(self._bounds, stats.buckets, stats.max, 50),
+                "p90": _quantile(self._bounds, stats.buckets, stats.max, 90),
+                "p99": _quantile(self._bounds, stats.buckets, stats.max, 99),
+            } for key, stats in self._methods.items()}
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        with self._lock:
+            self._methods = {}
+
+    def to_prometheus(self, prefix: str = "steam_api") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names
+        :type prefix: str
+        :return: Metrics text, e.g. the body of a ``/metrics`` endpoint
+        :rtype: str
+        """
+        with self._lock:
+            methods = sorted(self._methods.items())
+            counters = (
+                ("calls_total", "Steam API calls.", lambda stats: [((), stats.calls)]),
+                ("responses_total", "HTTP responses received, by status code.",
+                 lambda stats: [((("status", status),), count) for status, count in sorted(stats.statuses.items())]),
+                ("errors_total", "Calls that raised, by exception type.",
+                 lambda stats: [((("error", error),), count) for error, count in sorted(stats.errors.items())]),
+                ("response_bytes_total", "Bytes of response bodies received.", lambda stats: [((), stats.bytes)]),
+                ("retries_total", "Requests sent again after a failure.", lambda stats: [((), stats.retries)]),
+                ("cache_hits_total", "Calls answered by a response cache.", lambda stats: [((), stats.cache_hits)]),
+                ("coalesced_total", "Calls that shared the request of an identical call in flight.",
+                 lambda stats: [((), stats.coalesced)]),
+            )
+            lines = []
+            for name, help_text, samples in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (interface, method), stats in methods:
+                    for labels, value in samples(stats):
+                        lines.append(self._sample(f"{prefix}_{name}", interface, method, labels, value))
+            name = f"{prefix}_call_duration_seconds"
+            lines.append(f"# HELP {name} Latency of Steam API calls, including retries and waits.")
+            lines.append(f"# TYPE {name} histogram")
+            for (interface, method), stats in methods:
+                cumulative = 0
+                for bound, count in zip(self._bounds + (float("inf"),), stats.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(self._sample(f"{name}_bucket", interface, method, (("le", le),), cumulative))
+                lines.append(self._sample(f"{name}_sum", interface, method, (), stats.seconds))
+                lines.append(self._sample(f"{name}_count", interface, method, (), stats.calls))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _sample(name: str, interface: str, method: str, labels: tuple, value) -> str:
+        labels = (("interface", interface), ("method", method)) + labels
+        return name + "{" + ",".join(f'{key}="{_label(value)}"' for key, value in labels) + "} " + str(value)
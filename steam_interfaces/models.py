@@ -0,0 +1,299 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import sys
+from array import array
+from typing import Callable, Dict, List, Tuple, Union
+
+_AVATAR_URL = "https://avatars.steamstatic.com/{0}{1}.jpg"
+
+
+class Model(object):
+    """
+    Base of the typed response records.
+
+    Fields live in ``__slots__`` instead of a per-record dict, so their names are not
+    stored with every record. Fields a response does not contain read as None, and
+    fields the model does not know are kept in a small dict. String fields that repeat
+    across records are interned. Models can also be read like the dicts they replace.
+
+    Records are converted eagerly, on construction, so reads stay plain attribute lookups
+    and the decoded dicts can be freed. Only packed fields, like ability upgrades, are
+    unpacked when read.
+    """
+
+    __slots__ = ("_extra",)
+
+    _fields = frozenset()
+    # Fields whose string values are interned.
+    _interned = frozenset()
+    # Response fields dropped because a property derives them from other fields.
+    _derived = frozenset()
+    # Fields converted on construction, by name.
+    _converters = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(name for name in cls.__slots__ if not name.startswith("_"))
+
+    def __init__(self, data: dict) -> None:
+        """
+        :param data: Record as decoded from the response
+        :type data: dict
+        """
+        extra = None
+        fields, interned, converters = self._fields, self._interned, self._converters
+        for name, value in data.items():
+            if name in converters:
+                converters[name](self, value)
+            elif name in fields:
+                if name in interned and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, name, value)
+            elif name not in self._derived:
+                if extra is None:
+                    extra = {}
+                extra[name] = value
+        self._extra = extra
+
+    def __getattr__(self, name: str):
+        # Only called for slots that were never set and for unknown names.
+        if name in self._fields:
+            return None
+        extra = object.__getattribute__(self, "_extra")
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, name: str):
+        try:
+            value = getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+        if value is None and not self._has(name):
+            raise KeyError(name)
+        return value
+
+    def get(self, name: str, default=None):
+        """Return a field like ``dict.get``."""
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def _has(self, name: str) -> bool:
+        # Converters may store a field in a private slot and expose it through a property.
+        slots = (name, "_" + name) if name in self._converters else (name,)
+        for cls in type(self).__mro__:
+            slot = next((slot for slot in slots if slot in getattr(cls, "__slots__", ())), None)
+            if slot is not None:
+                try:
+                    object.__getattribute__(self, slot)
+                    return True
+                except AttributeError:
+                    return False
+        return name in self._derived or (self._extra is not None and name in self._extra)
+
+    def __contains__(self, name: str) -> bool:
+        return self._has(name)
+
+    def to_dict(self) -> dict:
+        """
+        Rebuild the response record.
+
+        :rtype: dict
+        """
+        data = {}
+        for cls in reversed(type(self).__mro__):
+            for name in getattr(cls, "__slots__", ()):
+                if name == "_extra":
+                    continue
+                try:
+                    value = object.__getattribute__(self, name)
+                except AttributeError:
+                    continue
+                if name.startswith("_"):
+                    name = name[1:]
+                    value = getattr(self, name)
+                data[name] = _to_plain(value)
+        for name in self._derived:
+            data[name] = getattr(self, name)
+        if self._extra is not None:
+            data.update(self._extra)
+        return data
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        key = next(iter(type(self).__slots__))
+        return f"{type(self).__name__}({key}={getattr(self, key)!r})"
+
+
+def _to_plain(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+class PlayerSummary(Model):
+    """Player of GetPlayerSummaries. The avatar URLs are derived from ``avatarhash``."""
+
+    __slots__ = ("steamid", "communityvisibilitystate", "profilestate", "personaname", "profileurl",
+                 "avatarhash", "lastlogoff", "personastate", "realname", "primaryclanid", "timecreated",
+                 "personastateflags", "commentpermission", "loccountrycode", "locstatecode", "loccityid",
+                 "gameid", "gameserverip", "gameextrainfo", "gameserversteamid", "lobbysteamid")
+
+    _interned = frozenset(("loccountrycode", "locstatecode", "gameid", "gameextrainfo", "primaryclanid"))
+    _derived = frozenset(("avatar", "avatarmedium", "avatarfull"))
+
+    def _avatar(self, size: str) -> Union[str, None]:
+        return _AVATAR_URL.format(self.avatarhash, size) if self.avatarhash is not None else None
+
+    @property
+    def avatar(self) -> Union[str, None]:
+        """32x32 avatar URL."""
+        return self._avatar("")
+
+    @property
+    def avatarmedium(self) -> Union[str, None]:
+        """64x64 avatar URL."""
+        return self._avatar("_medium")
+
+    @property
+    def avatarfull(self) -> Union[str, None]:
+        """184x184 avatar URL."""
+        return self._avatar("_full")
+
+
+class PlayerBans(Model):
+    """Player of GetPlayerBans."""
+
+    __slots__ = ("SteamId", "CommunityBanned", "VACBanned", "NumberOfVACBans", "DaysSinceLastBan",
+                 "NumberOfGameBans", "EconomyBan")
+
+    _interned = frozenset(("EconomyBan",))
+
+
+class OwnedGame(Model):
+    """Game of GetOwnedGames."""
+
+    __slots__ = ("appid", "name", "playtime_2weeks", "playtime_forever", "img_icon_url",
+                 "has_community_visible_stats", "playtime_windows_forever", "playtime_mac_forever",
+                 "playtime_linux_forever", "playtime_deck_forever", "rtime_last_played",
+                 "playtime_disconnected", "content_descriptorids", "has_leaderboards")
+
+    # Names and icons repeat across the libraries of every player.
+    _interned = frozenset(("name", "img_icon_url"))
+
+
+def _set_ability_upgrades(player: "MatchPlayer", upgrades: List[dict]) -> None:
+    packed = array("i")
+    for upgrade in upgrades:
+        packed.extend((upgrade["ability"], upgrade["time"], upgrade["level"]))
+    player._ability_upgrades = packed
+
+
+class MatchPlayer(Model):
+    """
+    Player of GetMatchDetails. Ability upgrades are packed into an integer array and
+    unpacked when read.
+    """
+
+    __slots__ = ("account_id", "player_slot", "team_number", "team_slot", "hero_id", "hero_variant",
+                 "item_0", "item_1", "item_2", "item_3", "item_4", "item_5",
+                 "backpack_0", "backpack_1", "backpack_2", "item_neutral", "item_neutral2",
+                 "kills", "deaths", "assists", "leaver_status", "last_hits", "denies",
+                 "gold_per_min", "xp_per_min", "level", "net_worth", "aghanims_scepter", "aghanims_shard",
+                 "moonshard", "hero_damage", "tower_damage", "hero_healing", "gold", "gold_spent",
+                 "scaled_hero_damage", "scaled_tower_damage", "scaled_hero_healing", "persona",
+                 "_ability_upgrades")
+
+    _interned = frozenset(("persona",))
+    _converters = {"ability_upgrades": _set_ability_upgrades}
+
+    @property
+    def ability_upgrades(self) -> Union[List[dict], None]:
+        """Ability upgrades as returned by the API."""
+        try:
+            packed = self._ability_upgrades
+        except AttributeError:
+            return None
+        return [{"ability": packed[i], "time": packed[i + 1], "level": packed[i + 2]}
+                for i in range(0, len(packed), 3)]
+
+
+def _set_players(match: "Match", players: List[dict]) -> None:
+    match.players = [MatchPlayer(player) for player in players]
+
+
+class Match(Model):
+    """Result of GetMatchDetails."""
+
+    __slots__ = ("match_id", "match_seq_num", "radiant_win", "duration", "pre_game_duration", "start_time",
+                 "tower_status_radiant", "tower_status_dire", "barracks_status_radiant", "barracks_status_dire",
+                 "cluster", "first_blood_time", "lobby_type", "human_players", "leagueid", "positive_votes",
+                 "negative_votes", "game_mode", "flags", "engine", "radiant_score", "dire_score",
+                 "players", "picks_bans", "radiant_team_id", "radiant_name", "dire_team_id", "dire_name")
+
+    _interned = frozenset(("radiant_name", "dire_name"))
+    _converters = {"players": _set_players}
+
+
+def _convert_list(container: Union[dict, None], field: str, model: type) -> Union[dict, None]:
+    """Copy ``container`` with the records of ``field`` turned into models."""
+    if not isinstance(container, dict) or not isinstance(container.get(field), list):
+        return container
+    return dict(container, **{field: [model(record) for record in container[field]]})
+
+
+def _player_summaries(response: dict) -> dict:
+    return dict(response, response=_convert_list(response.get("response"), "players", PlayerSummary))
+
+
+def _player_bans(response: dict) -> dict:
+    return _convert_list(response, "players", PlayerBans)
+
+
+def _owned_games(response: dict) -> dict:
+    return dict(response, response=_convert_list(response.get("response"), "games", OwnedGame))
+
+
+def _match_details(response: dict) -> dict:
+    result = response.get("result")
+    if not isinstance(result, dict) or "match_id" not in result:
+        return response
+    return dict(response, result=Match(result))
+
+
+# Conversion of the responses of each typed method, by (interface, method).
+TYPED_METHODS: Dict[Tuple[str, str], Callable[[dict], dict]] = {
+    ("ISteamUser", "GetPlayerSummaries"): _player_summaries,
+    ("ISteamUser", "GetPlayerBans"): _player_bans,
+    ("IPlayerService", "GetOwnedGames"): _owned_games,
+    ("IDOTA2Match_570", "GetMatchDetails"): _match_details,
+}
+
+
+def typed_response(interface: str, method: str, response: Union[dict, None]) -> Union[dict, None]:
+    """
+    Replace the records of a response by models, if the method has any.
+    The response keeps its shape and the decoded response is not modified.
+
+    :param interface: Steam API interface
+    :type interface: str
+    :param method: Steam API method
+    :type method: str
+    :param response: Decoded response
+    :type response: dict
+    :return: Response with typed records
+    :rtype: dict
+    """
+    convert = TYPED_METHODS.get((interface, method))
+    if convert is None or not isinstance(response, dict):
+        return response
+    return convert(response)
@@ -0,0 +1,414 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from .checkpoint import FileCheckpoint
+
+
+class OwnershipSyncError(Exception):
+    """Raised when ownership data could not be fetched; the checkpoint is left where it was."""
+
+
+class OwnershipStore(object):
+    """
+    Local table of app ownership per SteamID, stored in SQLite.
+
+    Every write replaces all rows of a SteamID, the way GetPublisherAppOwnership returns
+    the complete ownership of one account.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """
+        :param path: Database file, created if it does not exist
+        :type path: str
+        :param timeout: Seconds to wait for another process holding the write lock
+        :type timeout: float
+        """
+        self._path = path
+        self._timeout = timeout
+        self._local = threading.local()
+        connection = self._connection
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS ownership ("
+                           "steamid INTEGER NOT NULL, appid INTEGER NOT NULL, ownsapp INTEGER NOT NULL, "
+                           "permanent INTEGER, timestamp TEXT, ownersteamid TEXT, "
+                           "PRIMARY KEY (steamid, appid))")
+        connection.execute("CREATE TABLE IF NOT EXISTS accounts (steamid INTEGER PRIMARY KEY, updated REAL NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS accounts_updated ON accounts (updated)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value REAL NOT NULL)")
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            self._local.connection = connection
+        return connection
+
+    def write(self, accounts: Iterable[Tuple[int, List[dict]]]) -> None:
+        """
+        Replace the ownership of several accounts in one transaction.
+
+        :param accounts: (steamid, apps) pairs, apps as returned by GetPublisherAppOwnership
+        :type accounts: Iterable[Tuple[int, List[dict]]]
+        """
+        now = time.time()
+        with self._connection as connection:
+            for steamid, apps in accounts:
+                steamid = int(steamid)
+                connection.execute("DELETE FROM ownership WHERE steamid = ?", (steamid,))
+                connection.executemany(
+                    "INSERT INTO ownership (steamid, appid, ownsapp, permanent, timestamp, ownersteamid) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(steamid, app["appid"], bool(app.get("ownsapp")), app.get("permanent"),
+                      app.get("timestamp"), app.get("ownersteamid")) for app in apps]
+                )
+                connection.execute("INSERT OR REPLACE INTO accounts (steamid, updated) VALUES (?, ?)", (steamid, now))
+
+    def apps(self, steamid: int) -> List[dict]:
+        """
+        Return the stored ownership of an account.
+
+        :param steamid: Steam ID
+        :type steamid: int
+        :return: Apps with the fields of GetPublisherAppOwnership
+        :rtype: List[dict]
+        """
+        rows = self._connection.execute("SELECT appid, ownsapp, permanent, timestamp, ownersteamid "
+                                        "FROM ownership WHERE steamid = ? ORDER BY appid", (int(steamid),))
+        return [{"appid": appid, "ownsapp": bool(ownsapp),
+                 "permanent": None if permanent is None else bool(permanent),
+                 "timestamp": timestamp, "ownersteamid": ownersteamid}
+                for appid, ownsapp, permanent, timestamp, ownersteamid in rows]
+
+    def owned(self) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate over every owned app.
+
+        :return: Iterator of (steamid, appid) pairs
+        """
+        return iter(self._connection.execute("SELECT steamid, appid FROM ownership WHERE ownsapp"))
+
+    def accounts(self) -> Iterator[Tuple[int, float]]:
+        """
+        Iterate over every synced account.
+
+        :return: Iterator of (steamid, last update as Unix time) pairs
+        """
+        return iter(self._connection.execute("SELECT steamid, updated FROM accounts"))
+
+    def changes(self, since: float) -> Iterator[Tuple[int, float, List[int]]]:
+        """
+        Iterate over the accounts written after a point in time.
+
+        :param since: Unix time
+        :type since: float
+        :return: Iterator of (steamid, last update, owned appids)
+        """
+        rows = self._connection.execute(
+            "SELECT accounts.steamid, accounts.updated, ownership.appid FROM accounts "
+            "LEFT JOIN ownership ON ownership.steamid = accounts.steamid AND ownership.ownsapp "
+            "WHERE accounts.updated > ? ORDER BY accounts.steamid", (since,)
+        )
+        current = None
+        for steamid, updated, appid in rows:
+            if current is None or current[0] != steamid:
+                if current is not None:
+                    yield current
+                current = (steamid, updated, [])
+            if appid is not None:
+                current[2].append(appid)
+        if current is not None:
+            yield current
+
+    def mark_synced(self) -> None:
+        """Record that the change feed was drained just now."""
+        with self._connection as connection:
+            connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('synced', ?)", (time.time(),))
+
+    def synced_at(self) -> Union[float, None]:
+        """
+        Return when the change feed was last drained.
+
+        :return: Unix time, None if it never was
+        :rtype: float
+        """
+        row = self._connection.execute("SELECT value FROM meta WHERE name = 'synced'").fetchone()
+        return row[0] if row is not None else None
+
+
+class OwnershipSync(object):
+    """
+    Keeps an OwnershipStore current from the GetPublisherAppOwnershipChanges feed.
+
+    Every page of changed SteamIDs is fanned out to concurrent GetPublisherAppOwnership
+    calls and written to the store before the row-version cursors are saved, so a crash
+    replays at most one page. SteamIDs Steam answers without ownership for, or whose call
+    still fails after the interface's retries, are saved with the cursors and fetched again
+    at the start of every following sync. Only a page on which every call fails stops the
+    sync, so one broken account does not hold the feed back.
+    """
+
+    def __init__(self,
+                 user,
+                 store: OwnershipStore,
+                 checkpoint: FileCheckpoint,
+                 concurrency: int = 8) -> None:
+        """
+        :param user: Interface used for the ownership calls
+        :type user: ISteamUser
+        :param store: Local ownership table
+        :type store: OwnershipStore
+        :param checkpoint: Where the package and CD key row versions are saved
+        :type checkpoint: FileCheckpoint
+        :param concurrency: Number of GetPublisherAppOwnership calls in flight
+        :type concurrency: int
+        """
+        if getattr(user, "_raw", False):
+            raise ValueError("OwnershipSync needs decoded responses, create the interface without raw=True!")
+        self._user = user
+        self._store = store
+        self._checkpoint = checkpoint
+        self._concurrency = concurrency
+        self._stopped = threading.Event()
+
+    def _fetch(self, steamid: str) -> Union[Tuple[int, List[dict]], None]:
+        """Fetch the ownership of an account, None if Steam answered without it."""
+        response = self._user.get_publisher_app_ownership(steamid)
+        if response is None:
+            raise OwnershipSyncError(f"Failed to fetch the app ownership of {steamid}!")
+        if "appownership" not in response:
+            return None
+        return int(steamid), response["appownership"].get("apps", [])
+
+    def _try_fetch(self, steamid: str) -> tuple:
+        try:
+            return steamid, self._fetch(steamid)
+        except Exception as error:
+            return steamid, error
+
+    def _fetch_all(self, executor, steamids: List[str]) -> Tuple[List[tuple], List[str], List[tuple]]:
+        """
+        Fetch and store the ownership of several accounts.
+
+        :return: Accounts written, SteamIDs Steam answered without ownership for,
+        and the SteamIDs whose call failed with their error
+        :rtype: Tuple[List[tuple], List[str], List[tuple]]
+        """
+        accounts, parked, errors = [], [], []
+        for steamid, result in executor.map(self._try_fetch, steamids):
+            if isinstance(result, Exception):
+                errors.append((str(steamid), result))
+            elif result is None:
+                parked.append(str(steamid))
+            else:
+                accounts.append(result)
+        self._store.write(accounts)
+        return accounts, parked, errors
+
+    def sync(self) -> int:
+        """
+        Follow the change feed until it is drained.
+
+        :return: Number of accounts updated
+        :rtype: int
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        cursors = self._checkpoint.load({"packagerowversion": "0", "cdkeyrowversion": "0"})
+        retry = cursors.pop("retry", [])
+        updated = 0
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor:
+            if retry:
+                # Whatever still fails stays parked; an outage shows up on the feed call below.
+                accounts, parked, errors = self._fetch_all(executor, retry)
+                updated += len(accounts)
+                retry = parked + [steamid for steamid, _ in errors]
+                self._checkpoint.save(dict(cursors, retry=retry) if retry else cursors)
+            while True:
+                response = self._user.get_publisher_app_ownership_changes(cursors["packagerowversion"],
+                                                                          cursors["cdkeyrowversion"])
+                if response is None or "ownershipchanges" not in response:
+                    raise OwnershipSyncError("Failed to fetch the ownership changes!")
+                changes = response["ownershipchanges"]
+                steamids = list(dict.fromkeys(change["steamid"] for change in changes.get("steamids", [])))
+                accounts, parked, errors = self._fetch_all(executor, steamids)
+                if errors and not accounts and not parked:
+                    # No call got an answer, Steam or the network is down: keep the cursors where they are.
+                    steamid, error = errors[0]
+                    if isinstance(error, OwnershipSyncError):
+                        raise error
+                    raise OwnershipSyncError(f"Failed to fetch the app ownership of {steamid}!") from error
+                updated += len(accounts)
+                retry = list(dict.fromkeys(retry + parked + [steamid for steamid, _ in errors]))
+                cursors = {
+                    "packagerowversion": changes.get("packagerowversion", cursors["packagerowversion"]),
+                    "cdkeyrowversion": changes.get("cdkeyrowversion", cursors["cdkeyrowversion"])
+                }
+                self._checkpoint.save(dict(cursors, retry=retry) if retry else cursors)
+                if not changes.get("moredata"):
+                    self._store.mark_synced()
+                    return updated
+
+    def run(self, interval: float = 60.0) -> None:
+        """
+        Sync every ``interval`` seconds until :meth:`stop` is called.
+        Failed syncs, whatever the error, are logged and retried at the next interval.
+
+        :param interval: Seconds between syncs
+        :type interval: float
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        self._stopped.clear()
+        while True:
+            try:
+                self.sync()
+            except Exception:
+                # Transport errors, denied keys and feed errors alike; the cursors were not moved.
+                logger.exception("Failed to sync the app ownership changes")
+            if self._stopped.wait(interval):
+                return
+
+    def stop(self) -> None:
+        """Make :meth:`run` return."""
+        self._stopped.set()
+
+
+class OwnershipIndex(object):
+    """
+    In-memory ownership lookups backed by an OwnershipStore.
+
+    Owned apps are kept in a dict of frozensets, so :meth:`owns` answers in microseconds.
+    The index reloads the accounts the sync engine wrote since its last refresh, possibly
+    from another process. The live CheckAppOwnership call is only made for accounts the
+    store does not know, or when the change feed was not drained for ``max_age`` seconds.
+    """
+
+    def __init__(self, store: OwnershipStore, user=None, max_age: float = 3600.0, live_maxsize: int = 10000) -> None:
+        """
+        :param store: Ownership table kept current by OwnershipSync
+        :type store: OwnershipStore
+        :param user: Interface used for the live fallback, None to never call Steam
+        :type user: ISteamUser
+        :param max_age: Seconds after the last drained sync at which local data is stale.
+        Live answers are remembered for as long.
+        :type max_age: float
+        :param live_maxsize: Maximum number of remembered live answers, the least recently used one is evicted first
+        :type live_maxsize: int
+        """
+        if getattr(user, "_raw", False):
+            raise ValueError("OwnershipIndex needs decoded responses, create the interface without raw=True!")
+        self._store = store
+        self._user = user
+        self._max_age = max_age
+        self._owned = {}
+        self._loaded_until = -1.0
+        self._synced_at = None
+        self._live = OrderedDict()
+        self._live_maxsize = live_maxsize
+        self._live_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def refresh(self) -> int:
+        """
+        Load the accounts written to the store since the last refresh.
+
+        :return: Number of accounts loaded
+        :rtype: int
+        """
+        with self._lock:
+            loaded = 0
+            for steamid, updated, appids in self._store.changes(self._loaded_until):
+                self._owned[steamid] = frozenset(appids)
+                self._loaded_until = max(self._loaded_until, updated)
+                loaded += 1
+            self._synced_at = self._store.synced_at()
+            return loaded
+
+    def _is_stale(self) -> bool:
+        return self._synced_at is None or time.time() - self._synced_at > self._max_age
+
+    def _check_live(self, steamid: int, appid: int) -> Union[bool, None]:
+        key = (steamid, appid)
+        with self._live_lock:
+            cached = self._live.get(key)
+            if cached is not None:
+                if time.time() - cached[1] <= self._max_age:
+                    self._live.move_to_end(key)
+                    return cached[0]
+                del self._live[key]
+        response = self._user.check_app_ownership(steamid, appid)
+        if response is None or "appownership" not in response:
+            return None
+        owns = bool(response["appownership"].get("ownsapp"))
+        with self._live_lock:
+            self._live[key] = (owns, time.time())
+            self._live.move_to_end(key)
+            while len(self._live) > self._live_maxsize:
+                self._live.popitem(last=False)
+        return owns
+
+    def owns(self, steamid: int, appid: int) -> bool:
+        """
+        Return whether an account owns an app.
+
+        :param steamid: Steam ID
+        :type steamid: int
+        :param appid: App ID
+        :type appid: int
+        :rtype: bool
+        """
+        steamid = int(steamid)
+        apps = self._owned.get(steamid)
+        if apps is not None and not self._is_stale():
+            return appid in apps
+        if self._user is not None:
+            owns = self._check_live(steamid, appid)
+            if owns is not None:
+                return owns
+        return apps is not None and appid in apps
+
+    def _run(self, interval: float) -> None:
+        import logging
+        logger = logging.getLogger(__name__)
+        while not self._stopped.wait(interval):
+            try:
+                self.refresh()
+            except sqlite3.Error:
+                # Keep serving the loaded data; the next refresh picks the changes up.
+                logger.exception("Failed to refresh the ownership index")
+
+    def start(self, interval: float = 10.0) -> "OwnershipIndex":
+        """
+        Load the index and keep refreshing it in the background.
+
+        :param interval: Seconds between refreshes
+        :type interval: float
+        :rtype: OwnershipIndex
+        """
+        self.refresh()
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="OwnershipIndex", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background refresh."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __len__(self) -> int:
+        return len(self._owned)
@@ -0,0 +1,114 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import threading
+import time
+from typing import Union
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a non-blocking rate limiter has no request left to give."""
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``. Blocking callers
+    reserve their token before sleeping, so waiters are served in arrival order at a
+    steady rate instead of waking up together.
+    """
+
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, rate: float, capacity: float = None) -> None:
+        """
+        :param rate: Requests per second
+        :type rate: float
+        :param capacity: Largest burst, defaults to one second worth of requests
+        :type capacity: float
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive!")
+        self.rate = rate
+        self.capacity = max(capacity if capacity is not None else rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_key(cls, key: Union[str, None], rate: float, capacity: float = None) -> "TokenBucket":
+        """
+        Return the bucket shared by everything using an API key, creating it on first use.
+
+        :param key: Steam API key
+        :type key: str
+        :param rate: Requests per second, used only when the bucket is created
+        :type rate: float
+        :param capacity: Largest burst, used only when the bucket is created
+        :type capacity: float
+        :return: Shared bucket
+        :rtype: TokenBucket
+        """
+        with cls._registry_lock:
+            bucket = cls._registry.get(key)
+            if bucket is None:
+                bucket = cls._registry[key] = cls(rate, capacity)
+            return bucket
+
+    def _reserve(self, blocking: bool, timeout: Union[float, None]) -> Union[float, None]:
+        """
+        Take a token, possibly one that is not there yet.
+
+        :return: Seconds to wait before the token may be used, None if it was not taken
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait and (not blocking or (timeout is not None and wait > timeout)):
+                return None
+            self._tokens -= 1
+            return wait
+
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
+        """
+        Take one request from the bucket.
+
+        :param blocking: Wait for a token instead of failing immediately
+        :type blocking: bool
+        :param timeout: Longest wait in seconds, None for no limit
+        :type timeout: float
+        :return: Whether a token was taken
+        :rtype: bool
+        """
+        wait = self._reserve(blocking, timeout)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, blocking: bool = True, timeout: float = None) -> bool:
+        """
+        Take one request from the bucket without blocking the event loop.
+
+        :param blocking: Wait for a token instead of failing immediately
+        :type blocking: bool
+        :param timeout: Longest wait in seconds, None for no limit
+        :type timeout: float
+        :return: Whether a token was taken
+        :rtype: bool
+        """
+        wait = self._reserve(blocking, timeout)
+        if wait is None:
+            return False
+        if wait:
+            import asyncio
+            await asyncio.sleep(wait)
+        return True
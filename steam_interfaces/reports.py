@@ -0,0 +1,191 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import json
+import queue
+import threading
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Tuple, Union
+
+# Marks the end of a shard in the result queue.
+_DONE = object()
+
+
+def time_shards(timebegin: int, timeend: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split a time range into contiguous windows of equal width.
+
+    Neighbouring windows share their boundary, so a report made exactly on it may be
+    returned by both; the exporters deduplicate by report ID.
+
+    :param timebegin: Start of the range (Unix epoch time)
+    :type timebegin: int
+    :param timeend: End of the range (Unix epoch time)
+    :type timeend: int
+    :param shards: Number of windows
+    :type shards: int
+    :return: (timebegin, timeend) pairs
+    :rtype: List[Tuple[int, int]]
+    """
+    width = max(1, -(-(timeend - timebegin) // max(1, shards)))
+    windows = []
+    start = timebegin
+    while start < timeend:
+        end = min(start + width, timeend)
+        windows.append((start, end))
+        start = end
+    return windows or [(timebegin, timeend)]
+
+
+def _reports_page(response: Union[dict, None], reportidmin: int) -> Tuple[List[dict], Union[int, None]]:
+    """
+    Split a GetCheatingReports page into its reports and the cursor of the next page.
+
+    :return: Reports and the next reportidmin, None after the last page
+    :rtype: Tuple[List[dict], int]
+    """
+    reports = (response or {}).get("response", {}).get("reports", [])
+    new = [report for report in reports if int(report["reportid"]) >= reportidmin]
+    if not new:
+        return new, None
+    return new, max(int(report["reportid"]) for report in new) + 1
+
+
+def _deduplicate(reports: List[dict], seen: set) -> List[dict]:
+    unique = []
+    for report in reports:
+        reportid = int(report["reportid"])
+        if reportid not in seen:
+            seen.add(reportid)
+            unique.append(report)
+    return unique
+
+
+def iter_cheating_reports(fetch: Callable[[int, int, int], dict],
+                          windows: List[Tuple[int, int]],
+                          reportidmin: int = 0) -> Iterator[dict]:
+    """
+    Yield the reports of every time window, fetching the windows concurrently.
+    Each window is paginated by ``reportidmin``. Reports are yielded as their page arrives
+    and only once, even when several windows return them.
+
+    :param fetch: Returns the page of a (timebegin, timeend, reportidmin)
+    :type fetch: Callable[[int, int, int], dict]
+    :param windows: (timebegin, timeend) pairs, see :func:`time_shards`
+    :type windows: List[Tuple[int, int]]
+    :param reportidmin: Smallest report ID to return
+    :type reportidmin: int
+    :return: Reports
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    results = queue.Queue(maxsize=2 * len(windows))
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def export_window(timebegin: int, timeend: int) -> None:
+        cursor = reportidmin
+        try:
+            while cursor is not None and not stopped.is_set():
+                reports, cursor = _reports_page(fetch(timebegin, timeend, cursor), cursor)
+                if reports and not put(reports):
+                    return
+        except Exception as error:
+            put(error)
+        finally:
+            put(_DONE)
+
+    executor = ThreadPoolExecutor(max_workers=len(windows))
+    try:
+        for timebegin, timeend in windows:
+            executor.submit(export_window, timebegin, timeend)
+        seen = set()
+        remaining = len(windows)
+        while remaining:
+            item = results.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                for report in _deduplicate(item, seen):
+                    yield report
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False)
+
+
+async def aiter_cheating_reports(fetch: Callable,
+                                 windows: List[Tuple[int, int]],
+                                 reportidmin: int = 0) -> AsyncIterator[dict]:
+    """Async version of :func:`iter_cheating_reports`, ``fetch`` is a coroutine function."""
+    import asyncio
+    results = asyncio.Queue(maxsize=2 * len(windows))
+
+    async def export_window(timebegin: int, timeend: int) -> None:
+        cursor = reportidmin
+        try:
+            while cursor is not None:
+                reports, cursor = _reports_page(await fetch(timebegin, timeend, cursor), cursor)
+                if reports:
+                    await results.put(reports)
+        except Exception as error:
+            await results.put(error)
+        finally:
+            await results.put(_DONE)
+
+    tasks = [asyncio.ensure_future(export_window(timebegin, timeend)) for timebegin, timeend in windows]
+    try:
+        seen = set()
+        remaining = len(windows)
+        while remaining:
+            item = await results.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                for report in _deduplicate(item, seen):
+                    yield report
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def write_ndjson(records: Iterable[dict], path: str) -> int:
+    """
+    Write records to a file, one JSON object per line.
+
+    :param records: Records to write
+    :type records: Iterable[dict]
+    :param path: Output file
+    :type path: str
+    :return: Number of records written
+    :rtype: int
+    """
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+            written += 1
+    return written
+
+
+async def awrite_ndjson(records: AsyncIterator[dict], path: str) -> int:
+    """Async version of :func:`write_ndjson`, ``records`` is an async iterator."""
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        async for record in records:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+            written += 1
+    return written
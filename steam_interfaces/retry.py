@@ -0,0 +1,218 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Tuple, Union
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Statuses that mean the Steam API is overloaded and the client should slow down.
+CONGESTION_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(response) -> Union[float, None]:
+    """
+    Return the seconds a ``Retry-After`` header asks to wait.
+
+    :param response: HTTP response, None if the request failed
+    :return: Seconds to wait, None without a valid header
+    :rtype: float
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if not retry_after:
+        return None
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        from email.utils import parsedate_to_datetime
+        try:
+            return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class Retry(object):
+    """
+    Retry policy for throttled and failed requests.
+
+    Waits grow exponentially with full jitter, and a ``Retry-After`` header from the
+    server takes precedence. POST requests are only retried on statuses that mean
+    the request was not processed, so a retry never submits anything twice.
+    """
+
+    def __init__(self,
+                 total: int = 3,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0,
+                 statuses: Tuple[int, ...] = CONGESTION_STATUSES,
+                 post_statuses: Tuple[int, ...] = (429,)) -> None:
+        """
+        :param total: Maximum number of retries of a request
+        :type total: int
+        :param backoff_factor: Upper bound in seconds of the first wait, doubled on every retry
+        :type backoff_factor: float
+        :param max_backoff: Longest wait in seconds
+        :type max_backoff: float
+        :param statuses: Statuses that make a GET request be retried
+        :type statuses: Tuple[int, ...]
+        :param post_statuses: Statuses that make a POST request be retried
+        :type post_statuses: Tuple[int, ...]
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.post_statuses = post_statuses
+
+    def is_retryable(self, attempt: int, http_method: str, response, error: Union[Exception, None]) -> bool:
+        """
+        Return whether a request should be sent again.
+
+        :param attempt: Number of retries already made
+        :type attempt: int
+        :param http_method: HTTP method
+        :type http_method: str
+        :param response: HTTP response, None if the request failed
+        :param error: Transport error, None if a response was received
+        :type error: Exception
+        :rtype: bool
+        """
+        if attempt >= self.total:
+            return False
+        if error is not None:
+            return http_method == "GET"
+        statuses = self.statuses if http_method == "GET" else self.post_statuses
+        return response.status_code in statuses
+
+    def backoff(self, attempt: int, response) -> float:
+        """
+        Return the seconds to wait before the next retry.
+
+        :param attempt: Number of retries already made
+        :type attempt: int
+        :param response: HTTP response, None if the request failed
+        :rtype: float
+        """
+        delay = parse_retry_after(response)
+        if delay is not None:
+            return min(delay, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+
+class AIMDLimiter(object):
+    """
+    Adaptive limit of concurrent requests, shared by threads and coroutines.
+
+    The limit grows by ``increase`` for every window of successful requests and is
+    multiplied by ``decrease`` when the server signals congestion, at most once per
+    window, the way TCP converges on the bandwidth of a link.
+    """
+
+    def __init__(self,
+                 initial: int = 8,
+                 minimum: int = 1,
+                 maximum: int = 256,
+                 increase: float = 1.0,
+                 decrease: float = 0.5) -> None:
+        """
+        :param initial: Starting limit
+        :type initial: int
+        :param minimum: Lowest limit
+        :type minimum: int
+        :param maximum: Highest limit
+        :type maximum: int
+        :param increase: Growth of the limit per window of successful requests
+        :type increase: float
+        :param decrease: Factor applied to the limit on congestion
+        :type decrease: float
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._window = 0
+        self._condition = threading.Condition()
+        self._waiters = []
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(self.minimum, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests in flight."""
+        return self._in_flight
+
+    def _try_acquire(self) -> Union[int, None]:
+        if self._in_flight < self.limit:
+            self._in_flight += 1
+            return self._window
+        return None
+
+    def acquire(self) -> int:
+        """
+        Wait for a free slot.
+
+        :return: Token to pass to :meth:`release`
+        :rtype: int
+        """
+        with self._condition:
+            token = self._try_acquire()
+            while token is None:
+                self._condition.wait()
+                token = self._try_acquire()
+            return token
+
+    async def acquire_async(self) -> int:
+        """
+        Wait for a free slot without blocking the event loop.
+
+        :return: Token to pass to :meth:`release`
+        :rtype: int
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                token = self._try_acquire()
+                if token is not None:
+                    return token
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, token: int, congested: bool) -> None:
+        """
+        Free a slot and adapt the limit to the outcome of the request.
+
+        :param token: Token returned when the slot was acquired
+        :type token: int
+        :param congested: Whether the server signalled congestion
+        :type congested: bool
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if congested:
+                # Requests started before the last decrease saw the old limit; react once per window.
+                if token == self._window:
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+                    self._window += 1
+            else:
+                self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+            self._condition.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+
+def _wake(waiter: "asyncio.Future") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
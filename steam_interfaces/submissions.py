@@ -0,0 +1,289 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Union
+
+
+class SubmissionFailed(Exception):
+    """Raised by the future of a submission Steam rejected or that ran out of attempts."""
+
+
+class SubmissionQueue(object):
+    """
+    Durable queue of cheat reports and ban requests, spooled in SQLite.
+
+    Submitting only writes the spool, so callers never wait on Steam. Worker threads drain
+    it concurrently through the interface, which applies its rate limits and retry policy.
+    Every submission has an idempotency key: submitting a key again returns the same
+    submission instead of filing another one, also across restarts. A submission is only
+    sent again if no response was received for it, including after a crash mid-request.
+
+    Several processes may drain the same spool. A worker claims a submission with a lease.
+    Other queues leave it alone until the lease runs out, which only happens when its
+    sender died. Idle workers resolve the futures of submissions another queue sent.
+    """
+
+    methods = ("report_player_cheating", "request_player_game_ban")
+
+    def __init__(self,
+                 reporting,
+                 path: str,
+                 concurrency: int = 4,
+                 max_attempts: int = 8,
+                 retry_delay: float = 5.0,
+                 timeout: float = 30.0,
+                 lease: float = 600.0) -> None:
+        """
+        :param reporting: Interface the submissions are sent through
+        :type reporting: ICheatReportingService
+        :param path: Spool database file, created if it does not exist
+        :type path: str
+        :param concurrency: Number of submissions in flight
+        :type concurrency: int
+        :param max_attempts: Attempts before a submission fails
+        :type max_attempts: int
+        :param retry_delay: Seconds before the second attempt, doubled after every further one
+        :type retry_delay: float
+        :param timeout: Seconds to wait for another process holding the write lock
+        :type timeout: float
+        :param lease: Seconds a claimed submission is reserved for its sender. After that it is
+        assumed lost and sent again, so it must exceed the longest send, retries included.
+        :type lease: float
+        """
+        self._reporting = reporting
+        self._path = path
+        self._concurrency = concurrency
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._timeout = timeout
+        self._lease = lease
+        # Identifies the claims of this queue among every process sharing the spool.
+        self._owner = uuid.uuid4().hex
+        self._local = threading.local()
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads = []
+        with self._connection as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS submissions ("
+                               "id TEXT PRIMARY KEY, method TEXT NOT NULL, params TEXT NOT NULL, "
+                               "status TEXT NOT NULL, attempts INTEGER NOT NULL, next_attempt REAL NOT NULL, "
+                               "response TEXT, updated REAL NOT NULL, owner TEXT, lease REAL NOT NULL DEFAULT 0)")
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(submissions)")}
+            if "owner" not in columns:
+                # Spools created before leases; their claims count as expired.
+                connection.execute("ALTER TABLE submissions ADD COLUMN owner TEXT")
+                connection.execute("ALTER TABLE submissions ADD COLUMN lease REAL NOT NULL DEFAULT 0")
+            connection.execute("CREATE INDEX IF NOT EXISTS submissions_pending "
+                               "ON submissions (status, next_attempt)")
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            self._local.connection = connection
+        return connection
+
+    def submit(self, method: str, params: dict, idempotency_key: str = None) -> Future:
+        """
+        Spool a submission.
+
+        :param method: Name of the interface method, one of :attr:`methods`
+        :type method: str
+        :param params: Keyword arguments of the method
+        :type params: dict
+        :param idempotency_key: Identifies the submission, by default a hash of the method and parameters.
+        Pass e.g. a match ID when identical submissions are legitimately repeated.
+        :type idempotency_key: str
+        :return: Future resolved with the Steam API response
+        :rtype: Future
+        """
+        if method not in self.methods:
+            raise ValueError("Unsupported method!")
+        params = json.dumps({name: value for name, value in params.items() if value is not None}, sort_keys=True)
+        if idempotency_key is None:
+            idempotency_key = hashlib.sha256(f"{method}:{params}".encode()).hexdigest()
+        with self._lock:
+            future = self._futures.get(idempotency_key)
+            if future is not None:
+                return future
+            now = time.time()
+            with self._connection as connection:
+                connection.execute("INSERT OR IGNORE INTO submissions "
+                                   "(id, method, params, status, attempts, next_attempt, updated) "
+                                   "VALUES (?, ?, ?, 'pending', 0, ?, ?)",
+                                   (idempotency_key, method, params, now, now))
+                status, response = connection.execute("SELECT status, response FROM submissions WHERE id = ?",
+                                                      (idempotency_key,)).fetchone()
+            future = Future()
+            if status in ("done", "failed"):
+                self._settle(future, status, response)
+                return future
+            self._futures[idempotency_key] = future
+        with self._ready:
+            self._ready.notify()
+        return future
+
+    def report_player_cheating(self, idempotency_key: str = None, **params) -> Future:
+        """
+        Spool :meth:`ICheatReportingService.report_player_cheating`.
+
+        :return: Future resolved with the Steam API response
+        :rtype: Future
+        """
+        return self.submit("report_player_cheating", params, idempotency_key)
+
+    def request_player_game_ban(self, idempotency_key: str = None, **params) -> Future:
+        """
+        Spool :meth:`ICheatReportingService.request_player_game_ban`.
+
+        :return: Future resolved with the Steam API response
+        :rtype: Future
+        """
+        return self.submit("request_player_game_ban", params, idempotency_key)
+
+    def _claim(self) -> Union[tuple, None]:
+        """
+        Lease the oldest due submission, or one whose sender's lease ran out, and return it.
+        The update only succeeds if no other queue claimed the submission in the meantime.
+        """
+        while True:
+            now = time.time()
+            with self._lock, self._connection as connection:
+                row = connection.execute("SELECT id, method, params, attempts FROM submissions "
+                                         "WHERE (status = 'pending' AND next_attempt <= ?) "
+                                         "OR (status = 'sending' AND lease < ?) "
+                                         "ORDER BY next_attempt LIMIT 1", (now, now)).fetchone()
+                if row is None:
+                    return None
+                claimed = connection.execute("UPDATE submissions SET status = 'sending', owner = ?, lease = ?, "
+                                             "updated = ? WHERE id = ? AND ((status = 'pending' AND "
+                                             "next_attempt <= ?) OR (status = 'sending' AND lease < ?))",
+                                             (self._owner, now + self._lease, now, row[0], now, now)).rowcount
+            if claimed:
+                return row
+
+    def _finish(self, idempotency_key: str, status: str, response: str, next_attempt: float = 0.0) -> None:
+        with self._lock:
+            with self._connection as connection:
+                # A received response is final. Otherwise the submission is only updated
+                # while this queue still holds its lease.
+                connection.execute("UPDATE submissions SET status = ?, response = ?, attempts = attempts + 1, "
+                                   "next_attempt = ?, owner = NULL, lease = 0, updated = ? "
+                                   "WHERE id = ? AND (? = 'done' OR owner = ?)",
+                                   (status, response, next_attempt, time.time(), idempotency_key,
+                                    status, self._owner))
+            future = self._futures.pop(idempotency_key, None) if status != "pending" else None
+        if future is not None:
+            self._settle(future, status, response)
+
+    @staticmethod
+    def _settle(future: Future, status: str, response: str) -> None:
+        """Resolve the future of a finished submission."""
+        if status == "done":
+            future.set_result(json.loads(response))
+        else:
+            future.set_exception(SubmissionFailed(response))
+
+    def _settle_finished(self) -> None:
+        """Resolve the futures of submissions that another queue sharing the spool finished."""
+        with self._lock:
+            keys = list(self._futures)
+        finished = []
+        # Stay below the number of parameters SQLite accepts in one statement.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            finished += self._connection.execute("SELECT id, status, response FROM submissions "
+                                                 "WHERE status IN ('done', 'failed') AND id IN (%s)"
+                                                 % ", ".join("?" * len(chunk)), chunk).fetchall()
+        for idempotency_key, status, response in finished:
+            with self._lock:
+                future = self._futures.pop(idempotency_key, None)
+            if future is not None:
+                self._settle(future, status, response)
+
+    def _send(self, idempotency_key: str, method: str, params: str, attempts: int) -> None:
+        try:
+            response = getattr(self._reporting, method)(**json.loads(params))
+        except (TypeError, ValueError) as error:
+            # Invalid parameters or a denied key; sending again would not help.
+            self._finish(idempotency_key, "failed", str(error))
+            return
+        except Exception as error:
+            response, reason = None, f"{type(error).__name__}: {error}"
+        else:
+            reason = "Steam did not accept the submission!"
+        if response is not None:
+            self._finish(idempotency_key, "done", json.dumps(response))
+        elif attempts + 1 >= self._max_attempts:
+            self._finish(idempotency_key, "failed", reason)
+        else:
+            self._finish(idempotency_key, "pending", reason, time.time() + self._retry_delay * 2 ** attempts)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            row = self._claim()
+            if row is None:
+                self._settle_finished()
+                with self._ready:
+                    self._ready.wait(min(1.0, self._retry_delay))
+                continue
+            self._send(*row)
+
+    def start(self) -> "SubmissionQueue":
+        """
+        Start draining the spool, including submissions left over from a previous run.
+
+        :rtype: SubmissionQueue
+        """
+        if not self._threads:
+            self._stopped.clear()
+            for index in range(self._concurrency):
+                thread = threading.Thread(target=self._run, name=f"SubmissionQueue-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """Stop draining once the submissions in flight are sent. Pending ones stay in the spool."""
+        self._stopped.set()
+        with self._ready:
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def pending(self) -> int:
+        """
+        Return the number of submissions not sent yet.
+
+        :rtype: int
+        """
+        return self._connection.execute("SELECT COUNT(*) FROM submissions "
+                                        "WHERE status IN ('pending', 'sending')").fetchone()[0]
+
+    def purge(self, older_than: float = 30 * 86400.0) -> int:
+        """
+        Forget finished submissions; their idempotency keys can then be submitted again.
+
+        :param older_than: Age in seconds of the submissions to forget
+        :type older_than: float
+        :return: Number of submissions removed
+        :rtype: int
+        """
+        with self._connection as connection:
+            return connection.execute("DELETE FROM submissions WHERE status IN ('done', 'failed') AND updated < ?",
+                                      (time.time() - older_than,)).rowcount
@@ -0,0 +1,128 @@
+"""
+:authors: Tarodictrl
+:license: MIT License, see LICENSE file
+:copyright: (c) 2023 Tarodictrl
+"""
+import threading
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    import requests
+    import requests.adapters
+
+# requests is imported by the first request: it is most of the import time of the package.
+
+
+class Transport(object):
+    """
+    Connection-pooled HTTP transport for the Steam API.
+
+    One transport can be shared by any number of interface instances and threads.
+    Connections are kept alive between requests, so only the first request to
+    partner.steam-api.com or api.steampowered.com pays for the TCP and TLS handshake.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 timeout: Union[float, tuple, None] = None) -> None:
+        """
+        :param pool_connections: Number of per-host connection pools to keep
+        :type pool_connections: int
+        :param pool_maxsize: Maximum number of connections kept open to a single host
+        :type pool_maxsize: int
+        :param pool_block: Block when all connections to a host are busy instead of opening a throwaway one
+        :type pool_block: bool
+        :param keep_alive: Reuse connections between requests
+        :type keep_alive: bool
+        :param timeout: Timeout in seconds passed to every request, or a (connect, read) tuple
+        :type timeout: Union[float, tuple, None]
+        """
+        self._pool = {"pool_connections": pool_connections, "pool_maxsize": pool_maxsize, "pool_block": pool_block}
+        self._adapter = None
+        self._adapter_lock = threading.Lock()
+        self._keep_alive = keep_alive
+        self._timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def default(cls) -> "Transport":
+        """
+        Return the process-wide transport used by interfaces created without one.
+
+        :return: Shared transport
+        :rtype: Transport
+        """
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    @property
+    def errors(self) -> tuple:
+        """Errors raised when no response was received."""
+        import requests
+        return requests.ConnectionError, requests.Timeout
+
+    @property
+    def adapter(self) -> "requests.adapters.HTTPAdapter":
+        """Connection pool shared by the sessions of every thread, created on first use."""
+        if self._adapter is None:
+            with self._adapter_lock:
+                if self._adapter is None:
+                    from requests.adapters import HTTPAdapter
+                    self._adapter = HTTPAdapter(**self._pool)
+        return self._adapter
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        Session bound to the calling thread.
+
+        Sessions are not shared between threads, but all of them are mounted on the
+        same adapter, so they draw connections from one thread-safe pool.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            if not self._keep_alive:
+                session.headers["Connection"] = "close"
+            self._local.session = session
+        return session
+
+    def request(self, http_method: str, url: str, params: dict, stream: bool = False) -> "requests.Response":
+        """
+        Send a request through the pool.
+
+        :param http_method: HTTP method
+        :type http_method: str
+        :param url: Request URL
+        :type url: str
+        :param params: Query string parameters
+        :type params: dict
+        :param stream: Return before the body is read; it must then be consumed or the response closed
+        :type stream: bool
+        :return: HTTP response
+        :rtype: requests.Response
+        """
+        return self.session.request(http_method, url, params=params, timeout=self._timeout, stream=stream)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        if self._adapter is not None:
+            self._adapter.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
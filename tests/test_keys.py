@@ -0,0 +1,34 @@
+import pytest
+
+from steam_interfaces import KeyPool, KeyPoolExhausted
+
+
+def test_429_benches_the_key_for_retry_after():
+    pool = KeyPool(["a"], cooldown=60)
+    pool.release(pool.acquire(), 429, 0)
+    assert pool.available_in() == 0
+    assert pool.acquire() == "a"
+
+
+def test_403_and_429_without_retry_after_use_the_cooldown():
+    for status_code in (403, 429):
+        pool = KeyPool(["a"], cooldown=60)
+        pool.release(pool.acquire(), status_code, None if status_code == 429 else 0)
+        assert 59 < pool.available_in() <= 60
+        with pytest.raises(KeyPoolExhausted):
+            pool.acquire()
+
+
+def test_benched_acquire_picks_the_first_key_back():
+    pool = KeyPool(["a", "b"], cooldown=60)
+    pool.release(pool.acquire(), 429, 30)
+    pool.release(pool.acquire(), 429, 10)
+    assert pool.acquire(benched=True) == "b"
+
+
+def test_benched_acquire_skips_keys_out_of_quota():
+    pool = KeyPool(["a"], daily_quota=1)
+    pool.release(pool.acquire(), 200)
+    assert pool.available_in() is None
+    with pytest.raises(KeyPoolExhausted):
+        pool.acquire(benched=True)
@@ -0,0 +1,67 @@
+import pytest
+
+from steam_interfaces import FileCheckpoint, OwnershipStore, OwnershipSync, OwnershipSyncError
+
+
+class FakeUser(object):
+    """Answers the ownership feed from a list of pages; ``broken`` accounts never get their ownership."""
+
+    def __init__(self, pages, broken=(), down=False):
+        self.pages = list(pages)
+        self.broken = set(broken)
+        self.down = down
+        self.feed_calls = 0
+
+    def get_publisher_app_ownership_changes(self, packagerowversion, cdkeyrowversion):
+        self.feed_calls += 1
+        if self.pages:
+            steamids, rowversion = self.pages.pop(0)
+        else:
+            steamids, rowversion = [], packagerowversion
+        return {"ownershipchanges": {"steamids": [{"steamid": steamid} for steamid in steamids],
+                                     "packagerowversion": rowversion, "cdkeyrowversion": "0",
+                                     "moredata": bool(self.pages)}}
+
+    def get_publisher_app_ownership(self, steamid):
+        if self.down:
+            return None
+        if steamid in self.broken:
+            return {"error": "Account unavailable"}
+        return {"appownership": {"apps": [{"appid": 570, "ownsapp": True}]}}
+
+
+def make_sync(tmp_path, user):
+    store = OwnershipStore(str(tmp_path / "ownership.sqlite3"))
+    checkpoint = FileCheckpoint(str(tmp_path / "cursor.json"))
+    return OwnershipSync(user, store, checkpoint), store, checkpoint
+
+
+def test_retry_list_of_permanently_failing_ids_does_not_block_the_feed(tmp_path):
+    user = FakeUser([(["1", "bad"], "1")], broken={"bad"})
+    sync, store, checkpoint = make_sync(tmp_path, user)
+
+    assert sync.sync() == 1
+    assert checkpoint.load()["retry"] == ["bad"]
+
+    user.pages = [(["2"], "2")]
+    assert sync.sync() == 1
+    assert user.feed_calls == 2
+    assert checkpoint.load() == {"packagerowversion": "2", "cdkeyrowversion": "0", "retry": ["bad"]}
+    assert dict(store.accounts()).keys() == {1, 2}
+
+
+def test_page_made_only_of_failing_ids_is_parked(tmp_path):
+    user = FakeUser([(["bad"], "1"), (["3"], "2")], broken={"bad"})
+    sync, store, checkpoint = make_sync(tmp_path, user)
+
+    assert sync.sync() == 1
+    assert checkpoint.load() == {"packagerowversion": "2", "cdkeyrowversion": "0", "retry": ["bad"]}
+
+
+def test_outage_keeps_the_cursors(tmp_path):
+    user = FakeUser([(["1", "2"], "1")], down=True)
+    sync, store, checkpoint = make_sync(tmp_path, user)
+
+    with pytest.raises(OwnershipSyncError):
+        sync.sync()
+    assert checkpoint.load() is None
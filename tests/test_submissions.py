@@ -0,0 +1,34 @@
+import threading
+
+from steam_interfaces.submissions import SubmissionQueue
+
+
+class FakeReporting(object):
+    def __init__(self, gate):
+        self.gate = gate
+        self.calls = 0
+
+    def report_player_cheating(self, **params):
+        self.calls += 1
+        self.gate.wait(5)
+        return {"result": params}
+
+
+def test_future_resolves_when_another_queue_sends_the_submission(tmp_path):
+    gate = threading.Event()
+    reporting = FakeReporting(gate)
+    path = str(tmp_path / "spool.sqlite3")
+    sender = SubmissionQueue(reporting, path, concurrency=1, retry_delay=0.1).start()
+    other = SubmissionQueue(reporting, path, concurrency=1, retry_delay=0.1)
+    try:
+        sent = sender.report_player_cheating(idempotency_key="match-1", steamid=1, appid=570)
+        while not reporting.calls:
+            gate.wait(0.01)
+        waiting = other.start().report_player_cheating(idempotency_key="match-1", steamid=1, appid=570)
+        assert not waiting.done()
+        gate.set()
+        assert sent.result(5) == waiting.result(5) == {"result": {"steamid": 1, "appid": 570}}
+        assert reporting.calls == 1
+    finally:
+        sender.stop()
+        other.stop()